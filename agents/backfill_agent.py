@@ -48,6 +48,7 @@ def backfill_symbol(api_key: str, symbol: str, days: int, db_path: str) -> bool:
         
         # Store bars
         stored = 0
+        ingested_at = datetime.utcnow().isoformat()
         for bar in bars:
             date_str = bar.get("datetime", "").split()[0]  # Extract date part
             if not date_str:
@@ -61,7 +62,8 @@ def backfill_symbol(api_key: str, symbol: str, days: int, db_path: str) -> bool:
                 float(bar.get("high", 0)),
                 float(bar.get("low", 0)),
                 float(bar.get("close", 0)),
-                float(bar.get("volume", 0))
+                float(bar.get("volume", 0)),
+                ingested_at=ingested_at
             )
         
         log_ingestion(db_path, symbol, "success", stored,
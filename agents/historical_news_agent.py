@@ -1,7 +1,6 @@
 """Agent for analyzing historical OHLC data and fetching news for significant price moves."""
 import sys
 import logging
-import hashlib
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -22,11 +21,6 @@ from utils.logging_config import setup_logging
 logger = logging.getLogger(__name__)
 
 
-def hash_url(url: str) -> str:
-    """Create hash for URL deduplication."""
-    return hashlib.md5(url.encode()).hexdigest()
-
-
 def calculate_daily_change(open_price: float, close_price: float) -> float:
     """Calculate daily price change percentage."""
     if open_price == 0:
@@ -88,15 +82,13 @@ def fetch_news_for_date(
         is_global_event = item.get("applies_to_all_stocks", False)
         
         if is_company_match or is_global_event:
-            url_hash = hash_url(item["url"])
             news_id = store_news_item(
                 db_path,
                 item["title"],
                 item["url"],
                 item.get("published_at"),
                 item.get("source_name") or item.get("source", ""),
-                f"predefined_{item.get('source_type', 'unknown')}",
-                url_hash
+                f"predefined_{item.get('source_type', 'unknown')}"
             )
             
             if news_id:
@@ -132,15 +124,13 @@ def fetch_news_for_date(
                     if not date_in_range(pub_date, date_str, days_before=2, days_after=2):
                         continue
                     
-                    url_hash = hash_url(item["url"])
                     news_id = store_news_item(
                         db_path,
                         item["title"],
                         item["url"],
                         item.get("published_at"),
                         item.get("source"),
-                        query,
-                        url_hash
+                        query
                     )
                     
                     if news_id:
@@ -225,7 +215,7 @@ def analyze_historical_data(
             )
             
             if has_news:
-                logger.debug(f"{symbol} {date_str}: News already exists, skipping")
+                logger.debug("%s %s: News already exists, skipping", symbol, date_str)
                 continue
             
             try:
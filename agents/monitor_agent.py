@@ -1,20 +1,98 @@
 """Agent for intraday price monitoring and signal detection."""
+import os
 import sys
+import math
 import logging
+from bisect import bisect_left
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import requests
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.config import Config
-from core.database import connect, store_signal, get_daily_ohlc, get_last_alert, update_alert_log
-from core.signals import detect_signals
-from core.tools import fetch_time_series
+from core.database import connect, store_signals_batch, get_daily_ohlc, get_last_alert, update_alert_log
+from core.signals import detect_signals, BarSeries, BAR_FIELDS, Signal
+from core.rolling import RollingMax, RollingMin
+from core.tools import fetch_bar_series
 from utils.market_hours import get_today_date
-from utils.logging_config import setup_logging
+from utils.logging_config import debug_enabled, setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Per-symbol rolling breakout window, kept across polls in a long-running process
+_breakout_state: dict[str, dict] = {}
+
+# Intraday bars cached per symbol between monitoring cycles
+BAR_CACHE_DIR = Path("data/cache")
+MONITOR_BARS = 50  # bars fetched on a cold start and kept per symbol
+MONITOR_DELTA_BARS = 5  # bars fetched when the cache already covers today
+
+
+def load_cached_bars(symbol: str) -> Optional[BarSeries]:
+    """Load the cached intraday bars for a symbol, or None if absent/unreadable."""
+    path = BAR_CACHE_DIR / f"{symbol}.npz"
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            return BarSeries(
+                datetime=data["datetime"].tolist(),
+                **{field: data[field] for field in BAR_FIELDS}
+            )
+    except Exception as e:
+        logger.warning(f"{symbol}: Ignoring unreadable bar cache: {e}")
+        return None
+
+
+def save_cached_bars(symbol: str, bars: BarSeries):
+    """Write a symbol's intraday bars to the cache (atomically replaces the old file)."""
+    try:
+        BAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BAR_CACHE_DIR / f"{symbol}.npz"
+        tmp_path = path.with_suffix(".npz.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                datetime=np.array(bars.datetime, dtype=str),
+                **{field: getattr(bars, field) for field in BAR_FIELDS}
+            )
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"{symbol}: Could not write bar cache: {e}")
+
+
+def fetch_monitor_bars(
+    api_key: str,
+    symbol: str,
+    today: str,
+    session: Optional[requests.Session] = None
+) -> Optional[BarSeries]:
+    """
+    Get the latest MONITOR_BARS intraday bars, fetching only new ones when possible.
+    
+    If the cache already holds today's bars, only the last MONITOR_DELTA_BARS are
+    requested and merged in (they replace any cached bars from their first
+    datetime on, so the still-forming bar is refreshed). A cold cache, or a gap
+    the delta does not cover, falls back to a full fetch.
+    """
+    cached = load_cached_bars(symbol)
+    if cached is not None and len(cached) and cached.datetime[-1].startswith(today):
+        delta = fetch_bar_series(api_key, symbol, "30min", MONITOR_DELTA_BARS, session=session)
+        if delta is not None and delta.datetime[0] <= cached.datetime[-1]:
+            keep = bisect_left(cached.datetime, delta.datetime[0])
+            bars = cached[:keep].append(delta)[-MONITOR_BARS:]
+            save_cached_bars(symbol, bars)
+            return bars
+    
+    bars = fetch_bar_series(api_key, symbol, "30min", MONITOR_BARS, session=session)
+    if bars is not None:
+        save_cached_bars(symbol, bars)
+    return bars
+
 
 def get_day_open(symbol: str, db_path: str, today: str) -> float:
     """Get today's opening price."""
@@ -27,10 +105,51 @@ def get_day_open(symbol: str, db_path: str, today: str) -> float:
     return 0.0
 
 
+def update_breakout_window(
+    symbol: str,
+    bars: BarSeries,
+    lookback: int
+) -> tuple[float, float]:
+    """
+    Feed closed bars not seen on earlier polls into the symbol's rolling window.
+    
+    The latest bar is still forming, so the window covers the `lookback` bars
+    before it, matching detect_signals' own lookback slice.
+    
+    Returns:
+        (prior_high, prior_low), NaN when the window holds no values
+    """
+    state = _breakout_state.get(symbol)
+    if state is None or state["lookback"] != lookback:
+        state = {
+            "lookback": lookback,
+            "next_index": 0,
+            "last_dt": "",
+            "high": RollingMax(lookback),
+            "low": RollingMin(lookback)
+        }
+        _breakout_state[symbol] = state
+    
+    start = max(len(bars) - (lookback + 1), 0)
+    highs = bars.high
+    lows = bars.low
+    for i in range(start, len(bars) - 1):
+        dt = bars.datetime[i]
+        if dt <= state["last_dt"]:
+            continue
+        index = state["next_index"]
+        state["high"].push(index, float(highs[i]))
+        state["low"].push(index, float(lows[i]))
+        state["next_index"] = index + 1
+        state["last_dt"] = dt
+    
+    return state["high"].peek(), state["low"].peek()
+
+
 def should_alert(
     db_path: str,
     symbol: str,
-    signal: dict,
+    signal: Signal,
     current_price: float,
     min_gap_min: int,
     re_alert_step_pct: float,
@@ -50,7 +169,7 @@ def should_alert(
         return False  # Still in cooldown
     
     # Check if direction flipped
-    metrics = signal.get("metrics", {})
+    metrics = signal.metrics
     direction = metrics.get("direction", "up" if metrics.get("pct_change", 0) > 0 else "down")
     last_direction = last_alert.get("last_alert_direction", "")
     
@@ -68,7 +187,7 @@ def should_alert(
             return True
     
     # Check severity increase
-    current_severity = signal.get("severity", "medium")
+    current_severity = signal.severity
     last_severity = last_alert.get("last_alert_severity", "medium")
     severity_levels = {"low": 1, "medium": 2, "high": 3}
     if severity_levels.get(current_severity, 0) > severity_levels.get(last_severity, 0):
@@ -81,59 +200,60 @@ def monitor_symbol(
     api_key: str,
     symbol: str,
     db_path: str,
-    cfg: Config
+    cfg: Config,
+    session: Optional[requests.Session] = None
 ) -> list[dict]:
     """Monitor one symbol and return detected signals."""
     try:
-        # Fetch intraday bars (30min interval, last 50 bars)
-        bars = fetch_time_series(api_key, symbol, "30min", 50)
+        today = get_today_date()
+        
+        # Intraday bars (30min interval, last 50 bars)
+        bars = fetch_monitor_bars(api_key, symbol, today, session=session)
         
         if not bars or len(bars) < 2:
             logger.warning(f"{symbol}: Insufficient intraday data")
             return []
         
         # Get today's open
-        today = get_today_date()
         day_open = get_day_open(symbol, db_path, today)
         
         # If no daily OHLC, try to get from first intraday bar of today
         if day_open == 0:
-            today_bars = [b for b in bars if b.get("datetime", "").startswith(today)]
-            if today_bars:
-                day_open = float(today_bars[0].get("open", 0))
+            first_today = next((i for i, dt in enumerate(bars.datetime) if dt.startswith(today)), None)
+            if first_today is not None and not math.isnan(bars.open[first_today]):
+                day_open = float(bars.open[first_today])
         
         if day_open == 0:
             logger.warning(f"{symbol}: Could not determine day open")
             return []
         
         # Detect signals
+        prior_high, prior_low = update_breakout_window(symbol, bars, cfg.breakout_lookback)
         signals = detect_signals(
             symbol,
             bars,
             day_open,
             cfg.move_pct,
             cfg.volume_spike_mult,
-            cfg.breakout_lookback
+            cfg.breakout_lookback,
+            prior_high=prior_high,
+            prior_low=prior_low
         )
         
         if not signals:
             return []
+        if debug_enabled():
+            logger.debug("%s: detected %s", symbol,
+                         ", ".join(f"{s.signal_type} ({s.severity})" for s in signals))
         
         # Store signals and check throttling
         alertable_signals = []
-        latest_price = float(bars[-1].get("close", 0))
-        
-        for signal in signals:
-            signal_id = store_signal(
-                db_path,
-                symbol,
-                bars[-1].get("datetime", ""),
-                signal["signal_type"],
-                signal["metrics"],
-                signal["severity"],
-                signal.get("bar_id")
-            )
-            
+        latest_price = float(bars.close[-1])
+        created_at = datetime.utcnow().isoformat()
+        
+        signal_ids = store_signals_batch(db_path, symbol, bars.datetime[-1], signals, created_at=created_at)
+        
+        for signal, signal_id in zip(signals, signal_ids):
             if signal_id and should_alert(db_path, symbol, signal, latest_price,
                                          cfg.min_alert_gap_min, cfg.re_alert_step_pct, cfg.move_pct):
                 alertable_signals.append({
@@ -143,8 +263,8 @@ def monitor_symbol(
                     "price": latest_price
                 })
                 # Update alert log
-                direction = signal["metrics"].get("direction", "up" if signal["metrics"].get("pct_change", 0) > 0 else "down")
-                update_alert_log(db_path, symbol, latest_price, direction, signal["severity"])
+                direction = signal.metrics.get("direction", "up" if signal.metrics.get("pct_change", 0) > 0 else "down")
+                update_alert_log(db_path, symbol, latest_price, direction, signal.severity)
         
         return alertable_signals
         
@@ -25,7 +25,7 @@ import requests
 
 from core.config import Config
 from core.database import connect
-from utils.logging_config import setup_logging
+from utils.logging_config import debug_enabled, setup_logging
 
 logger = logging.getLogger(__name__)
 
@@ -226,13 +226,13 @@ class TwelveDataClient:
                 if attempt == 3:
                     raise
                 sleep_s = 1.5 * attempt
-                logger.debug(f"TwelveData GET retry {attempt}/3 after HTTP error: {e}. Sleeping {sleep_s}s")
+                logger.debug("TwelveData GET retry %s/3 after HTTP error: %s. Sleeping %ss", attempt, e, sleep_s)
                 time.sleep(sleep_s)
             except Exception as e:
                 if attempt == 3:
                     raise
                 sleep_s = 1.5 * attempt
-                logger.debug(f"TwelveData GET retry {attempt}/3 after error: {e}. Sleeping {sleep_s}s")
+                logger.debug("TwelveData GET retry %s/3 after error: %s. Sleeping %ss", attempt, e, sleep_s)
                 time.sleep(sleep_s)
 
         raise RuntimeError("Unreachable")
@@ -539,7 +539,7 @@ def determine_trend(
     elif start_price is not None and latest_price is not None:
         # Fallback: if no bars or insufficient data, use Start vs Now comparison
         trend_up = latest_price > start_price
-        logger.debug(f"{symbol}: Using fallback Start vs Now comparison (Start={start_price:.2f}, Now={latest_price:.2f})")
+        logger.debug("%s: Using fallback Start vs Now comparison (Start=%.2f, Now=%.2f)", symbol, start_price, latest_price)
 
     if trade_price is not None:
         # Open position exists
@@ -617,19 +617,19 @@ def process_most_active_trends(cfg: Config) -> None:
             bars_30m = intraday_map.get(sym, []) or []
             daily_bars = daily_map.get(sym, []) or []
 
-            # Log bar count for debugging
+            # Log bar count for debugging; the closes are only needed for that
             num_bars = len(bars_30m)
-            if num_bars > 0:
+            if num_bars == 0:
+                logger.warning(f"{sym}: No intraday bars available")
+            elif debug_enabled():
                 bar_closes = [safe_float(b.get("close")) for b in bars_30m if safe_float(b.get("close")) is not None]
                 if len(bar_closes) >= 2:
                     first_close = bar_closes[0]
                     last_close = bar_closes[-1]
                     price_change = ((last_close - first_close) / first_close * 100) if first_close > 0 else 0
-                    logger.debug(f"{sym}: {num_bars} bars, first_close={first_close:.2f}, last_close={last_close:.2f}, change={price_change:+.2f}%")
+                    logger.debug("%s: %s bars, first_close=%.2f, last_close=%.2f, change=%+.2f%%", sym, num_bars, first_close, last_close, price_change)
                 else:
-                    logger.debug(f"{sym}: {num_bars} bars, but only {len(bar_closes)} valid closes")
-            else:
-                logger.warning(f"{sym}: No intraday bars available")
+                    logger.debug("%s: %s bars, but only %s valid closes", sym, num_bars, len(bar_closes))
 
             prices = compute_prices(bars_30m, daily_bars, now_utc)
             trend = determine_trend(bars_30m, prices, cfg.sqlite_path, sym)
@@ -1,7 +1,6 @@
 """Agent for fetching news for triggered tickers."""
 import sys
 import logging
-import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -15,10 +14,8 @@ from utils.logging_config import setup_logging
 
 logger = logging.getLogger(__name__)
 
-
-def hash_url(url: str) -> str:
-    """Create hash for URL deduplication."""
-    return hashlib.md5(url.encode()).hexdigest()
+# Skip sector/macro queries once a symbol has this many news items
+NEWS_TARGET_COUNT = 8
 
 
 def fetch_news_for_symbol(
@@ -54,7 +51,6 @@ def fetch_news_for_symbol(
                 is_global_event = item.get("applies_to_all_stocks", False)
                 
                 if is_company_match or is_global_event:
-                    url_hash = hash_url(item["url"])
                     relevance = "direct" if is_company_match else "macro_global"
                     news_id = store_news_item(
                         db_path,
@@ -62,8 +58,7 @@ def fetch_news_for_symbol(
                         item["url"],
                         item.get("published_at"),
                         item.get("source_name") or item.get("source", ""),
-                        f"predefined_{item.get('source_type', 'unknown')}",
-                        url_hash
+                        f"predefined_{item.get('source_type', 'unknown')}"
                     )
                     if news_id:
                         link_signal_news(db_path, signal_id, news_id, relevance)
@@ -83,34 +78,33 @@ def fetch_news_for_symbol(
             for query in queries:
                 items = fetch_google_news(query, limit=5)
                 for item in items:
-                    url_hash = hash_url(item["url"])
                     news_id = store_news_item(
                         db_path,
                         item["title"],
                         item["url"],
                         item.get("published_at"),
                         item.get("source"),
-                        query,
-                        url_hash
+                        query
                     )
                     if news_id:
                         link_signal_news(db_path, signal_id, news_id, "direct")
                         news_items["direct"].append(item)
         
+        # Only top up with sector/macro news while coverage is below target
+        have = len(news_items["direct"]) + len(news_items["sector_macro"])
+        
         # Sector query
-        if sector:
+        if sector and have < NEWS_TARGET_COUNT:
             sector_query = f"{sector} sector {symbol}"
             items = fetch_google_news(sector_query, limit=3)
             for item in items:
-                url_hash = hash_url(item["url"])
                 news_id = store_news_item(
                     db_path,
                     item["title"],
                     item["url"],
                     item.get("published_at"),
                     item.get("source"),
-                    sector_query,
-                    url_hash
+                    sector_query
                 )
                 if news_id:
                     link_signal_news(db_path, signal_id, news_id, "sector_macro")
@@ -124,22 +118,22 @@ def fetch_news_for_symbol(
             "stock market index",
         ]
         
-        for query in macro_queries:
-            items = fetch_google_news(query, limit=2)
-            for item in items:
-                url_hash = hash_url(item["url"])
-                news_id = store_news_item(
-                    db_path,
-                    item["title"],
-                    item["url"],
-                    item.get("published_at"),
-                    item.get("source"),
-                    query,
-                    url_hash
-                )
-                if news_id:
-                    link_signal_news(db_path, signal_id, news_id, "sector_macro")
-                    news_items["sector_macro"].append(item)
+        have = len(news_items["direct"]) + len(news_items["sector_macro"])
+        if have < NEWS_TARGET_COUNT:
+            for query in macro_queries:
+                items = fetch_google_news(query, limit=2)
+                for item in items:
+                    news_id = store_news_item(
+                        db_path,
+                        item["title"],
+                        item["url"],
+                        item.get("published_at"),
+                        item.get("source"),
+                        query
+                    )
+                    if news_id:
+                        link_signal_news(db_path, signal_id, news_id, "sector_macro")
+                        news_items["sector_macro"].append(item)
         
         if news_items["direct"] or news_items["sector_macro"]:
             news_items["none_found"] = False
@@ -163,18 +157,16 @@ def fetch_news_for_signals(
     logger.info(f"Fetching news for {len(signals)} signals...")
     
     news_by_symbol = {}
+    sector_map = cfg.sector_map
     
     for signal_data in signals:
         symbol = signal_data["symbol"]
         signal_id = signal_data["signal_id"]
         
         if symbol not in news_by_symbol:
-            sector = cfg.sector_map.get(symbol)
+            sector = sector_map.get(symbol)
             news_items = fetch_news_for_symbol(symbol, sector, db_path, signal_id)
             news_by_symbol[symbol] = news_items
-        
-        import time
-        time.sleep(0.5)  # Be polite to Google News
     
     return news_by_symbol
 
@@ -1,19 +1,58 @@
 """CrewAI agent for summarizing alerts."""
+import io
 import sys
 import logging
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from crewai import Agent, Task, Crew
 from core.config import Config
 # Summarizer doesn't need database access - works with provided signals
 from utils.logging_config import setup_logging
 
+if TYPE_CHECKING:
+    from crewai import Agent
+
 logger = logging.getLogger(__name__)
 
+_summarizer_agent: Optional["Agent"] = None
+_summarizer_lock = threading.Lock()
+
+
+def get_summarizer_agent() -> "Agent":
+    """
+    Get the shared summarizer agent, building it on first use.
+    
+    crewai is imported here rather than at module import, after its storage
+    location is set.
+    """
+    global _summarizer_agent
+    if _summarizer_agent is None:
+        with _summarizer_lock:
+            if _summarizer_agent is None:
+                # Point CrewAI storage (state.sqlite etc.) at the database folder; an
+                # absolute path is used as-is instead of a name under the user data
+                # dir. Must be set before crewai is imported.
+                database_dir = Path("database").resolve()
+                database_dir.mkdir(exist_ok=True)
+                os.environ.setdefault("CREWAI_STORAGE_DIR", str(database_dir))
+                from crewai import Agent
+                
+                _summarizer_agent = Agent(
+                    role="Stock Alert Summarizer",
+                    goal="Create concise, factual stock alert summaries with relevant news context",
+                    backstory="""You are a professional financial alert writer. You create clear, 
+                    no-hype summaries of stock price movements with relevant news context. You 
+                    explicitly state when no clear driver is found. You group alerts by ticker 
+                    and keep messages under 2000 characters.""",
+                    verbose=False,
+                )
+    return _summarizer_agent
+
 
 def generate_alert_summary(signals: list[dict], cfg: Config) -> str:
     """Generate alert summary using CrewAI."""
@@ -28,51 +67,47 @@ def generate_alert_summary(signals: list[dict], cfg: Config) -> str:
             signals_by_symbol[symbol] = []
         signals_by_symbol[symbol].append(sig)
     
-    # Build context
-    context_lines = ["STOCK ALERT SUMMARY\n" + "="*60 + "\n"]
-    context_lines.append(f"Timestamp: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}\n")
+    # Build context (each line after the banner is written with a leading newline)
+    buf = io.StringIO()
+    w = buf.write
+    w("STOCK ALERT SUMMARY\n" + "="*60 + "\n")
+    w(f"\nTimestamp: {datetime.utcnow():%Y-%m-%d %H:%M UTC}\n")
     
     for symbol, symbol_signals in signals_by_symbol.items():
-        context_lines.append(f"\n{symbol}:")
+        w(f"\n\n{symbol}:")
         for sig in symbol_signals:
             signal_type = sig["signal_type"]
             metrics = sig["metrics"]
-            severity = sig["severity"]
             
             if signal_type == "move_from_open":
                 pct = metrics.get("pct_change", 0)
                 direction = "UP" if pct > 0 else "DOWN"
-                context_lines.append(f"  - {signal_type.upper()}: {abs(pct):.2f}% {direction} from open")
+                w(f"\n  - {signal_type.upper()}: {abs(pct):.2f}% {direction} from open")
             elif signal_type == "volume_spike":
                 mult = metrics.get("multiplier", 0)
-                context_lines.append(f"  - {signal_type.upper()}: {mult:.1f}x average volume")
+                w(f"\n  - {signal_type.upper()}: {mult:.1f}x average volume")
             elif signal_type in ["breakout", "breakdown"]:
-                context_lines.append(f"  - {signal_type.upper()}: Price {signal_type}")
+                w(f"\n  - {signal_type.upper()}: Price {signal_type}")
             
-            # Add news
-            news = sig.get("news", [])
+            # Add news, skipping "none_found" markers so no empty bullets are emitted
+            news = [
+                item for item in sig.get("news", [])
+                if item.get("relevance", "unknown") != "none_found"
+            ][:3]
             if news:
-                context_lines.append("    News:")
-                for item in news[:3]:
-                    relevance = item.get("relevance", "unknown")
-                    if relevance != "none_found":
-                        context_lines.append(f"      • {item.get('title', '')[:80]}")
-                        context_lines.append(f"        {item.get('url', '')}")
+                w("\n    News:")
+                for item in news:
+                    title = item.get("title", "")
+                    w(f"\n      • {title[:80]}")
+                    w(f"\n        {item.get('url', '')}")
             else:
-                context_lines.append("    News: No clear driver found")
+                w("\n    News: No clear driver found")
     
-    context = "\n".join(context_lines)
+    context = buf.getvalue()
     
-    # Create CrewAI agent
-    summarizer = Agent(
-        role="Stock Alert Summarizer",
-        goal="Create concise, factual stock alert summaries with relevant news context",
-        backstory="""You are a professional financial alert writer. You create clear, 
-        no-hype summaries of stock price movements with relevant news context. You 
-        explicitly state when no clear driver is found. You group alerts by ticker 
-        and keep messages under 2000 characters.""",
-        verbose=False,
-    )
+    # Reuse the CrewAI agent across calls
+    summarizer = get_summarizer_agent()
+    from crewai import Task, Crew
     
     task = Task(
         description=(
@@ -89,14 +124,7 @@ def generate_alert_summary(signals: list[dict], cfg: Config) -> str:
         agent=summarizer,
     )
     
-    # Configure CrewAI to use database folder for state.sqlite
-    database_dir = Path("database")
-    database_dir.mkdir(exist_ok=True)
-    original_cwd = os.getcwd()
-    
     try:
-        # Change to database directory so CrewAI creates state.sqlite there
-        os.chdir(database_dir)
         crew = Crew(agents=[summarizer], tasks=[task], verbose=False)
         result = crew.kickoff()
         return str(result).strip()
@@ -104,10 +132,6 @@ def generate_alert_summary(signals: list[dict], cfg: Config) -> str:
         logger.error(f"Error generating summary: {e}", exc_info=True)
         # Fallback to simple format
         return context
-    finally:
-        # Restore original working directory
-        os.chdir(original_cwd)
-
 
 if __name__ == "__main__":
     setup_logging("INFO", "summarizer.log")
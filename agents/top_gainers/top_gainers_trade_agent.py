@@ -8,9 +8,10 @@ Monitors top gainers trend data and tracks buy/sell signals.
 
 import sys
 import logging
+import sqlite3
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -24,180 +25,264 @@ TREND_TABLE_NAME = "yahoo_top_gainers_trend"
 GAINERS_TABLE_NAME = "yahoo_top_gainers"
 TRADES_TABLE_NAME = "yahoo_top_gainers_trades"
 
+# Max symbols bound into one IN (...) list (SQLite variable limit can be 999)
+IN_CLAUSE_BATCH_SIZE = 500
+
+# SQL statements are built once so every call passes byte-identical text and
+# SQLite's per-connection statement cache can reuse the compiled plan
+SQL_INIT_TRADES_TABLE = f"""
+CREATE TABLE IF NOT EXISTS "{TRADES_TABLE_NAME}" (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    name TEXT,
+    buy_price REAL,
+    buy_time TEXT,
+    sale_price REAL,
+    sale_time TEXT,
+    created_at TEXT NOT NULL,
+    UNIQUE(symbol, buy_time)
+);
+CREATE INDEX IF NOT EXISTS idx_trades_symbol_buy_time 
+ON "{TRADES_TABLE_NAME}"(symbol, buy_time DESC);
+-- Only open positions, so open-position lookups stay small as trades accumulate
+CREATE INDEX IF NOT EXISTS "idx_{TRADES_TABLE_NAME}_open"
+ON "{TRADES_TABLE_NAME}"(symbol, buy_time DESC)
+WHERE sale_price IS NULL AND sale_time IS NULL;
+"""
+
+SQL_GET_STOCK_NAME = (
+    f'SELECT "Name" FROM "{GAINERS_TABLE_NAME}" WHERE "Symbol" = ? ORDER BY "Scraped At (UTC)" DESC LIMIT 1'
+)
+
+# {placeholders} is filled with one "?" per symbol in the batch
+SQL_GET_STOCK_NAMES_BULK = f'''
+SELECT "Symbol", "Name" FROM (
+    SELECT "Symbol", "Name",
+           ROW_NUMBER() OVER (PARTITION BY "Symbol" ORDER BY "Scraped At (UTC)" DESC) AS rn
+    FROM "{GAINERS_TABLE_NAME}"
+    WHERE "Symbol" IN ({{placeholders}})
+)
+WHERE rn = 1
+'''
+
+SQL_GET_LATEST_TRENDS = f'''
+SELECT "Symbol", "Trend", "Now", "Scraped At (UTC)"
+FROM "{TREND_TABLE_NAME}"
+WHERE "Scraped At (UTC)" = (SELECT MAX("Scraped At (UTC)") FROM "{TREND_TABLE_NAME}")
+ORDER BY "Symbol" ASC
+'''
+
+SQL_GET_OPEN_POSITION = f'''
+SELECT id, symbol, name, buy_price, buy_time
+FROM "{TRADES_TABLE_NAME}"
+WHERE symbol = ? AND sale_price IS NULL AND sale_time IS NULL
+ORDER BY buy_time DESC
+LIMIT 1
+'''
+
+SQL_HAS_OPEN_POSITION = f'''
+SELECT 1 FROM "{TRADES_TABLE_NAME}"
+WHERE symbol = ? AND sale_price IS NULL AND sale_time IS NULL
+LIMIT 1
+'''
+
+# {placeholders} is filled with one "?" per symbol in the batch
+SQL_GET_OPEN_POSITIONS_BULK = f'''
+SELECT id, symbol, name, buy_price, buy_time
+FROM "{TRADES_TABLE_NAME}"
+WHERE symbol IN ({{placeholders}}) AND sale_price IS NULL AND sale_time IS NULL
+ORDER BY buy_time ASC
+'''
+
+# Only insert if the symbol still has no open position, so the check
+# and the insert happen in the same statement
+SQL_INSERT_BUY = f'''
+INSERT OR IGNORE INTO "{TRADES_TABLE_NAME}"
+(symbol, name, buy_price, buy_time, created_at)
+SELECT ?, ?, ?, ?, ?
+WHERE NOT EXISTS (
+    SELECT 1 FROM "{TRADES_TABLE_NAME}"
+    WHERE symbol = ? AND sale_price IS NULL AND sale_time IS NULL
+)
+'''
+
+SQL_UPDATE_SALE = f'''
+UPDATE "{TRADES_TABLE_NAME}"
+SET sale_price = ?, sale_time = ?
+WHERE id = ?
+'''
+
+# Report layout
+SEPARATOR = "=" * 80
+DASH = "-" * 80
+ROW_FMT = "{:<4} {:<8} {:<30} {:<6} {:<10} {:<20} {:<15}"
+SIGNAL_ROW_FMT = "{:<4} {:<8} {:<30} {:<6} ${:<9.2f} {:<20} {:<15}"
+TABLE_HEADER = ROW_FMT.format("#", "Symbol", "Name", "Trend", "Price", "Signal", "Action") + "\n" + DASH
+
+# Names rarely change, so found names are memoized for the life of the process
+STOCK_NAME_CACHE_SIZE = 4096
+_stock_name_cache: Dict[str, str] = {}
+
+
+def _cache_stock_name(symbol: str, name: str):
+    """Remember a stock name, dropping the cache when it reaches its size limit."""
+    if len(_stock_name_cache) >= STOCK_NAME_CACHE_SIZE:
+        _stock_name_cache.clear()
+    _stock_name_cache[symbol] = name
+
 
 def init_trades_table(conn):
     """Initialize the trades table if it doesn't exist."""
-    sql = f"""
-    CREATE TABLE IF NOT EXISTS "{TRADES_TABLE_NAME}" (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        symbol TEXT NOT NULL,
-        name TEXT,
-        buy_price REAL,
-        buy_time TEXT,
-        sale_price REAL,
-        sale_time TEXT,
-        created_at TEXT NOT NULL,
-        UNIQUE(symbol, buy_time)
-    );
-    CREATE INDEX IF NOT EXISTS idx_trades_symbol_buy_time 
-    ON "{TRADES_TABLE_NAME}"(symbol, buy_time DESC);
-    """
-    conn.executescript(sql)
+    conn.executescript(SQL_INIT_TRADES_TABLE)
     conn.commit()
 
 
-def get_stock_name(db_path: str, symbol: str) -> Optional[str]:
+def get_stock_name(conn: sqlite3.Connection, symbol: str) -> Optional[str]:
     """Get stock name from yahoo_top_gainers table."""
-    conn = connect(db_path)
-    try:
-        cur = conn.execute(
-            f'SELECT "Name" FROM "{GAINERS_TABLE_NAME}" WHERE "Symbol" = ? ORDER BY "Scraped At (UTC)" DESC LIMIT 1',
-            (symbol,)
-        )
-        row = cur.fetchone()
-        return row[0] if row and row[0] else None
-    finally:
-        conn.close()
+    if symbol in _stock_name_cache:
+        return _stock_name_cache[symbol]
+    cur = conn.execute(SQL_GET_STOCK_NAME, (symbol,))
+    row = cur.fetchone()
+    if row and row[0]:
+        _cache_stock_name(symbol, row[0])
+        return row[0]
+    return None
 
 
-def get_latest_trends(db_path: str) -> List[Dict]:
+def get_stock_names_bulk(conn: sqlite3.Connection, symbols: List[str]) -> Dict[str, str]:
+    """Get the latest stock name for each symbol from yahoo_top_gainers table."""
+    names = {s: _stock_name_cache[s] for s in symbols if s in _stock_name_cache}
+    missing = [s for s in symbols if s not in names]
+    for start in range(0, len(missing), IN_CLAUSE_BATCH_SIZE):
+        batch = missing[start:start + IN_CLAUSE_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        cur = conn.execute(SQL_GET_STOCK_NAMES_BULK.format(placeholders=placeholders), batch)
+        for symbol, name in cur:
+            if name:
+                names[symbol] = name
+                _cache_stock_name(symbol, name)
+    return names
+
+
+def get_latest_trends(conn: sqlite3.Connection) -> List[Dict]:
     """Get latest trend data for all symbols."""
-    conn = connect(db_path)
-    try:
-        # Get the latest scrape timestamp
-        cur = conn.execute(f'SELECT MAX("Scraped At (UTC)") FROM "{TREND_TABLE_NAME}"')
-        latest_ts = cur.fetchone()[0]
-        
-        if not latest_ts:
-            return []
-        
-        # Get all trends from latest scrape
-        cur = conn.execute(
-            f'''
-            SELECT "Symbol", "Trend", "Now", "Scraped At (UTC)"
-            FROM "{TREND_TABLE_NAME}"
-            WHERE "Scraped At (UTC)" = ?
-            ORDER BY "Symbol" ASC
-            ''',
-            (latest_ts,)
-        )
-        
-        trends = []
-        for row in cur.fetchall():
-            trends.append({
-                "Symbol": row[0],
-                "Trend": row[1],
-                "Price": row[2],
-                "Scraped At": row[3]
-            })
-        
-        return trends
-    finally:
-        conn.close()
+    # Get all trends from the latest scrape in one query
+    cur = conn.execute(SQL_GET_LATEST_TRENDS)
+    
+    return [
+        {
+            "Symbol": row["Symbol"],
+            "Trend": row["Trend"],
+            "Price": row["Now"],
+            "Scraped At": row["Scraped At (UTC)"]
+        }
+        for row in cur
+    ]
 
 
-def get_open_position(db_path: str, symbol: str) -> Optional[Dict]:
+def get_open_position(conn: sqlite3.Connection, symbol: str) -> Optional[Dict]:
     """Get the most recent open position (buy without sale) for a symbol."""
-    conn = connect(db_path)
-    try:
-        cur = conn.execute(
-            f'''
-            SELECT id, symbol, name, buy_price, buy_time
-            FROM "{TRADES_TABLE_NAME}"
-            WHERE symbol = ? AND sale_price IS NULL AND sale_time IS NULL
-            ORDER BY buy_time DESC
-            LIMIT 1
-            ''',
-            (symbol,)
-        )
-        row = cur.fetchone()
-        if row:
-            return {
-                "id": row[0],
-                "symbol": row[1],
-                "name": row[2],
-                "buy_price": row[3],
-                "buy_time": row[4]
-            }
-        return None
-    finally:
-        conn.close()
+    cur = conn.execute(SQL_GET_OPEN_POSITION, (symbol,))
+    row = cur.fetchone()
+    return dict(row) if row else None
 
 
-def has_latest_buy(db_path: str, symbol: str) -> bool:
+def get_open_positions_bulk(conn: sqlite3.Connection, symbols: List[str]) -> Dict[str, Dict]:
+    """Get the most recent open position for each symbol that has one."""
+    positions = {}
+    for start in range(0, len(symbols), IN_CLAUSE_BATCH_SIZE):
+        batch = symbols[start:start + IN_CLAUSE_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        cur = conn.execute(SQL_GET_OPEN_POSITIONS_BULK.format(placeholders=placeholders), batch)
+        # Ascending order, so the most recent buy per symbol wins
+        for row in cur:
+            positions[row["symbol"]] = dict(row)
+    return positions
+
+
+def has_latest_buy(conn: sqlite3.Connection, symbol: str) -> bool:
     """Check if the latest trade record for a symbol is already a buy (open position)."""
-    open_position = get_open_position(db_path, symbol)
-    return open_position is not None
+    return conn.execute(SQL_HAS_OPEN_POSITION, (symbol,)).fetchone() is not None
 
 
-def record_buy(db_path: str, symbol: str, name: Optional[str], price: float, buy_time: str):
-    """Record a buy signal."""
-    conn = connect(db_path)
+def record_buys(
+    conn: sqlite3.Connection, buys: List[Tuple[str, Optional[str], float, str]]
+) -> List[Tuple[str, Optional[str], float, str]]:
+    """
+    Record buy signals (symbol, name, price, buy_time) in one transaction.
+    
+    The trades table must already exist (see init_trades_table). Buys for a
+    symbol that already has an open position are skipped.
+    
+    Returns:
+        The buys actually inserted (empty if the transaction failed)
+    """
+    if not buys:
+        return []
     try:
-        init_trades_table(conn)
-        
         created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
         
-        conn.execute(
-            f'''
-            INSERT INTO "{TRADES_TABLE_NAME}"
-            (symbol, name, buy_price, buy_time, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            ''',
-            (symbol, name, price, buy_time, created_at)
-        )
+        recorded = []
+        for symbol, name, price, buy_time in buys:
+            cursor = conn.execute(SQL_INSERT_BUY, (symbol, name, price, buy_time, created_at, symbol))
+            if cursor.rowcount > 0:
+                recorded.append((symbol, name, price, buy_time))
         conn.commit()
-        logger.info(f"Recorded BUY: {symbol} ({name}) at ${price:.2f} at {buy_time}")
+        for symbol, name, price, buy_time in recorded:
+            logger.info(f"Recorded BUY: {symbol} ({name}) at ${price:.2f} at {buy_time}")
+        return recorded
     except Exception as e:
-        logger.error(f"Error recording buy for {symbol}: {e}", exc_info=True)
-    finally:
-        conn.close()
+        conn.rollback()
+        logger.error(f"Error recording {len(buys)} buys: {e}", exc_info=True)
+        return []
 
 
-def record_sale(db_path: str, trade_id: int, symbol: str, price: float, sale_time: str):
-    """Record a sell signal for an existing buy."""
-    conn = connect(db_path)
+def record_sales(conn: sqlite3.Connection, sales: List[Tuple[int, str, float, str, Optional[float]]]):
+    """Record sell signals (trade_id, symbol, price, sale_time, buy_price) for existing buys in one transaction."""
+    if not sales:
+        return
     try:
-        # Get buy price before updating
-        cur = conn.execute(f'SELECT buy_price FROM "{TRADES_TABLE_NAME}" WHERE id = ?', (trade_id,))
-        row = cur.fetchone()
-        buy_price = row[0] if row else None
-        
-        # Update with sale information
-        conn.execute(
-            f'''
-            UPDATE "{TRADES_TABLE_NAME}"
-            SET sale_price = ?, sale_time = ?
-            WHERE id = ?
-            ''',
-            (price, sale_time, trade_id)
+        conn.executemany(
+            SQL_UPDATE_SALE,
+            [(price, sale_time, trade_id) for trade_id, _, price, sale_time, _ in sales]
         )
         conn.commit()
         
-        if buy_price:
-            profit = price - buy_price
-            profit_pct = ((price - buy_price) / buy_price) * 100 if buy_price > 0 else 0
-            logger.info(
-                f"Recorded SALE: {symbol} at ${price:.2f} at {sale_time} "
-                f"(Bought: ${buy_price:.2f}, Profit: ${profit:.2f} ({profit_pct:+.2f}%))"
-            )
-        else:
-            logger.info(f"Recorded SALE: {symbol} at ${price:.2f} at {sale_time}")
+        for _, symbol, price, sale_time, buy_price in sales:
+            if buy_price:
+                profit = price - buy_price
+                profit_pct = ((price - buy_price) / buy_price) * 100 if buy_price > 0 else 0
+                logger.info(
+                    f"Recorded SALE: {symbol} at ${price:.2f} at {sale_time} "
+                    f"(Bought: ${buy_price:.2f}, Profit: ${profit:.2f} ({profit_pct:+.2f}%))"
+                )
+            else:
+                logger.info(f"Recorded SALE: {symbol} at ${price:.2f} at {sale_time}")
     except Exception as e:
-        logger.error(f"Error recording sale for {symbol}: {e}", exc_info=True)
-    finally:
-        conn.close()
+        conn.rollback()
+        logger.error(f"Error recording {len(sales)} sales: {e}", exc_info=True)
 
 
 def process_trade_signals(cfg: Config):
     """Process trend data and generate buy/sell signals."""
+    conn = connect(cfg.sqlite_path)
+    # Rows support both index and column-name access
+    conn.row_factory = sqlite3.Row
+    try:
+        _process_trade_signals(conn)
+    finally:
+        conn.close()
+
+
+def _process_trade_signals(conn: sqlite3.Connection):
+    """Process trend data over a single shared connection."""
     logger.info("="*60)
     logger.info("Top Gainers Trade Agent - Processing Trade Signals")
     logger.info("="*60)
     
     # Get latest trends
     logger.info("Fetching latest trend data...")
-    trends = get_latest_trends(cfg.sqlite_path)
+    trends = get_latest_trends(conn)
     
     if not trends:
         logger.warning("No trend data found")
@@ -206,25 +291,22 @@ def process_trade_signals(cfg: Config):
     logger.info(f"Found {len(trends)} symbols with trend data")
     
     # Initialize trades table
-    conn = connect(cfg.sqlite_path)
-    try:
-        init_trades_table(conn)
-    finally:
-        conn.close()
+    init_trades_table(conn)
     
-    invest_list = []
-    buy_count = 0
+    # Look up names and open positions for all symbols up front
+    symbols = [t["Symbol"] for t in trends]
+    names = get_stock_names_bulk(conn, symbols)
+    open_positions = get_open_positions_bulk(conn, symbols)
+    
+    buys = []
+    sales = []
     sell_count = 0
     hold_count = 0
     no_action_count = 0
     
     # Print and log header
-    header = "\n" + "="*80 + "\n" + "TRADE SIGNALS FOR ALL SYMBOLS\n" + "="*80
-    table_header = f"{'#':<4} {'Symbol':<8} {'Name':<30} {'Trend':<6} {'Price':<10} {'Signal':<20} {'Action':<15}\n" + "-"*80
-    print(header)
-    print(table_header)
-    logger.info(header)
-    logger.info(table_header)
+    logger.info("\n" + SEPARATOR + "\nTRADE SIGNALS FOR ALL SYMBOLS\n" + SEPARATOR)
+    logger.info(TABLE_HEADER)
     
     for i, trend_data in enumerate(trends, start=1):
         symbol = trend_data["Symbol"]
@@ -234,17 +316,15 @@ def process_trade_signals(cfg: Config):
         
         if not price:
             logger.warning(f"{symbol}: No price data, skipping")
-            no_data_line = f"{i:<4} {symbol:<8} {'N/A':<30} {'N/A':<6} {'N/A':<10} {'NO DATA':<20} {'SKIP':<15}"
-            print(no_data_line)
-            logger.info(no_data_line)
+            logger.info(ROW_FMT.format(i, symbol, "N/A", "N/A", "N/A", "NO DATA", "SKIP"))
             continue
         
         # Get stock name
-        name = get_stock_name(cfg.sqlite_path, symbol)
+        name = names.get(symbol)
         display_name = (name or 'N/A')[:28]  # Truncate if too long
         
         # Get open position status
-        open_position = get_open_position(cfg.sqlite_path, symbol)
+        open_position = open_positions.get(symbol)
         
         signal = ""
         action = ""
@@ -253,9 +333,7 @@ def process_trade_signals(cfg: Config):
         if trend == "Up":
             if not open_position:
                 # No open position exists, open a new position
-                record_buy(cfg.sqlite_path, symbol, name, float(price), scraped_at)
-                buy_count += 1
-                invest_list.append({"symbol": symbol, "name": name, "price": price})
+                buys.append((symbol, name, float(price), scraped_at))
                 signal = "🟢 BUY"
                 action = "NEW POSITION"
                 action_taken = True
@@ -268,13 +346,13 @@ def process_trade_signals(cfg: Config):
                 signal = "🟢 BUY (HOLD)"
                 action = f"HOLD @ ${buy_price:.2f}"
                 hold_count += 1
-                logger.debug(f"{symbol}: Trend is Up, position already open at ${buy_price:.2f} - keeping position open")
+                logger.debug("%s: Trend is Up, position already open at $%.2f - keeping position open", symbol, buy_price)
         
         elif trend == "Down":
             if open_position:
                 # Position is open, close it
                 buy_price = open_position['buy_price']
-                record_sale(cfg.sqlite_path, open_position["id"], symbol, float(price), scraped_at)
+                sales.append((open_position["id"], symbol, float(price), scraped_at, buy_price))
                 sell_count += 1
                 profit = price - buy_price
                 profit_pct = ((price - buy_price) / buy_price * 100) if buy_price > 0 else 0
@@ -287,16 +365,18 @@ def process_trade_signals(cfg: Config):
                 signal = "🔴 SELL"
                 action = "NO POSITION"
                 no_action_count += 1
-                logger.debug(f"{symbol}: Trend is Down, but no open position to close - doing nothing")
+                logger.debug("%s: Trend is Down, but no open position to close - doing nothing", symbol)
         
         # Print and log signal for this symbol
-        signal_line = f"{i:<4} {symbol:<8} {display_name:<30} {trend:<6} ${price:<9.2f} {signal:<20} {action:<15}"
-        print(signal_line)
-        logger.info(signal_line)
+        logger.info(SIGNAL_ROW_FMT.format(i, symbol, display_name, trend, price, signal, action))
+    
+    # Write all buys and sales in one transaction each
+    # Buys skipped because the symbol already had an open position are not counted
+    recorded_buys = record_buys(conn, buys)
+    record_sales(conn, sales)
+    buy_count = len(recorded_buys)
     
-    # Print and log summary
-    summary_separator = "="*80
-    summary_header = "\n" + summary_separator + "\n" + "TRADE SIGNALS SUMMARY\n" + summary_separator
+    # Log summary (setup_logging also echoes INFO records to stdout)
     summary_lines = [
         f"Total symbols analyzed: {len(trends)}",
         f"🟢 New BUY signals (new positions opened): {buy_count}",
@@ -304,25 +384,19 @@ def process_trade_signals(cfg: Config):
         f"🔴 SELL signals (positions closed): {sell_count}",
         f"🔴 NO ACTION (no position to close): {no_action_count}",
         f"Current open positions: {buy_count + hold_count}",
-        summary_separator
+        SEPARATOR
     ]
     
-    print(summary_separator)
-    print(summary_header)
+    logger.info(SEPARATOR)
+    logger.info("\n" + SEPARATOR + "\nTRADE SIGNALS SUMMARY\n" + SEPARATOR)
     for line in summary_lines:
-        print(line)
         logger.info(line)
     
-    if invest_list:
-        invest_header = "\n" + summary_separator + "\n" + "NEW POSITIONS OPENED (INVEST NOW)\n" + summary_separator
-        print(invest_header)
-        logger.info(invest_header)
-        for item in invest_list:
-            invest_line = f"🟢 BUY: {item['symbol']} - {item['name'] or 'N/A'} @ ${item['price']:.2f}"
-            print(invest_line)
-            logger.info(invest_line)
-        print(summary_separator)
-        logger.info(summary_separator)
+    if recorded_buys:
+        logger.info("\n" + SEPARATOR + "\nNEW POSITIONS OPENED (INVEST NOW)\n" + SEPARATOR)
+        for symbol, name, price, _ in recorded_buys:
+            logger.info(f"🟢 BUY: {symbol} - {name or 'N/A'} @ ${price:.2f}")
+        logger.info(SEPARATOR)
 
 
 def main():
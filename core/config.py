@@ -3,9 +3,15 @@ from dataclasses import dataclass
 from typing import Optional, Any
 import os
 import json
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 
@@ -31,6 +37,29 @@ def _parse_int(key: str, default: int, min_val: int = 1) -> int:
         raise ValueError(f"Invalid {key}: {e}")
 
 
+def _load_json_file(path: Path) -> dict[str, Any]:
+    """Load a JSON file, returning {} if it is missing or invalid."""
+    if not path.exists():
+        return {}
+    try:
+        data = path.read_bytes()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except Exception:
+        return {}
+
+
+@lru_cache(maxsize=1)
+def _load_sector_map() -> dict[str, str]:
+    """Load data/sector_map.json once per process."""
+    return _load_json_file(Path("data/sector_map.json"))
+
+
+@lru_cache(maxsize=1)
+def _load_news_sources() -> dict[str, Any]:
+    """Load data/news_sources.json once per process."""
+    return _load_json_file(Path("data/news_sources.json"))
+
+
 @dataclass(frozen=True)
 class Config:
     """Application configuration."""
@@ -84,25 +113,9 @@ class Config:
             raise ValueError("WATCHLIST is required")
         watchlist = [s.strip().upper() for s in watchlist_str.split(",") if s.strip()]
         
-        # Load sector map
-        sector_map_path = Path("data/sector_map.json")
-        sector_map = {}
-        if sector_map_path.exists():
-            try:
-                with open(sector_map_path) as f:
-                    sector_map = json.load(f)
-            except Exception:
-                pass
-        
-        # Load news sources (optional)
-        news_sources_path = Path("data/news_sources.json")
-        news_sources = {}
-        if news_sources_path.exists():
-            try:
-                with open(news_sources_path) as f:
-                    news_sources = json.load(f)
-            except Exception:
-                pass
+        # Load sector map and news sources (optional), cached across calls
+        sector_map = _load_sector_map()
+        news_sources = _load_news_sources()
         
         return cls(
             twelve_data_api_key=os.getenv("TWELVE_DATA_API_KEY", ""),
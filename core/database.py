@@ -1,11 +1,24 @@
 """Database schema and operations."""
+import atexit
 import sqlite3
-from typing import Optional, Any
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional, Any
 from datetime import datetime
 import logging
 
+if TYPE_CHECKING:
+    # Annotation only; importing core.signals pulls in numpy/numba
+    from core.signals import Signal
+
 logger = logging.getLogger(__name__)
 
+# UPDATE/INSERT ... RETURNING needs SQLite >= 3.35
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Max ids bound into one IN (...) list (SQLite variable limit can be 999)
+IN_CLAUSE_BATCH_SIZE = 500
+
 # Single database schema with all tables
 SCHEMA = """
 -- Daily OHLC data (historical/backfill)
@@ -70,13 +83,11 @@ CREATE TABLE IF NOT EXISTS news_items (
   title TEXT NOT NULL,
   source TEXT,
   url TEXT NOT NULL,
-  query TEXT,
-  hash TEXT NOT NULL,
-  UNIQUE(hash)
+  query TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_news_items_hash 
-  ON news_items(hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_news_items_url 
+  ON news_items(url);
 
 -- Signal-News links
 CREATE TABLE IF NOT EXISTS signal_news_links (
@@ -119,16 +130,95 @@ CREATE INDEX IF NOT EXISTS idx_top_gainers_symbol_detected
 """
 
 
+# Database paths whose schema has already been initialized in this process
+_initialized_paths: set[str] = set()
+
+
+def _drop_news_hash_column(conn: sqlite3.Connection):
+    """
+    Rebuild news_items without its legacy hash column.
+    
+    url is the dedup key now; older databases have hash NOT NULL UNIQUE,
+    which would otherwise force every insert to keep writing it. Row ids are
+    kept, so signal and OHLC links stay valid.
+    """
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(news_items)")]
+    if "hash" not in columns:
+        return
+    conn.executescript("""
+        BEGIN;
+        CREATE TABLE news_items_new (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          published_at TEXT,
+          title TEXT NOT NULL,
+          source TEXT,
+          url TEXT NOT NULL,
+          query TEXT
+        );
+        INSERT INTO news_items_new (id, published_at, title, source, url, query)
+          SELECT id, published_at, title, source, url, query FROM news_items;
+        DROP TABLE news_items;
+        ALTER TABLE news_items_new RENAME TO news_items;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_news_items_url ON news_items(url);
+        COMMIT;
+    """)
+
+
 def connect(db_path: str) -> sqlite3.Connection:
-    """Connect to database and initialize all tables."""
+    """Connect to database, initializing all tables on first use in this process."""
     from pathlib import Path
-    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    first_use = db_path not in _initialized_paths
+    if first_use:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     conn.execute("PRAGMA journal_mode=WAL;")
-    conn.executescript(SCHEMA)
+    # Per-connection tuning: WAL makes synchronous=NORMAL safe against corruption
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+    conn.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+    conn.execute("PRAGMA busy_timeout=5000;")
+    if first_use:
+        conn.executescript(SCHEMA)
+        _drop_news_hash_column(conn)
+        # In-memory databases are fresh on every connect
+        if db_path != ":memory:":
+            _initialized_paths.add(db_path)
     return conn
 
 
+# Per-thread connection cache used by db(); sqlite3 connections must stay on
+# the thread that opened them
+_local = threading.local()
+
+
+@contextmanager
+def db(db_path: str) -> Iterator[sqlite3.Connection]:
+    """
+    Yield this thread's cached connection to db_path, opening it on first use.
+    
+    Rows come back as sqlite3.Row. Any transaction still open when the block
+    exits (e.g. after a failed write) is rolled back so no lock is left held.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conns[db_path] = conn
+        # Worker-thread connections close when the thread exits; atexit runs
+        # on the main thread and may only close connections opened there
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(conn.close)
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+
+
 def store_daily_ohlc(
     db_path: str,
     symbol: str,
@@ -138,24 +228,23 @@ def store_daily_ohlc(
     low: float,
     close: float,
     volume: float,
-    source: str = "twelve_data"
+    source: str = "twelve_data",
+    ingested_at: Optional[str] = None
 ) -> int:
-    """Store daily OHLC data."""
-    conn = connect(db_path)
-    try:
-        conn.execute(
-            """INSERT OR REPLACE INTO stock_history 
-               (symbol, date, open, high, low, close, volume, source, ingested_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (symbol, date, open_price, high, low, close, volume, source, datetime.utcnow().isoformat())
-        )
-        conn.commit()
-        return 1
-    except Exception as e:
-        logger.error(f"Error storing OHLC for {symbol} on {date}: {e}")
-        return 0
-    finally:
-        conn.close()
+    """Store daily OHLC data. Pass ingested_at to reuse one timestamp across a bulk load."""
+    with db(db_path) as conn:
+        try:
+            conn.execute(
+                """INSERT OR REPLACE INTO stock_history 
+                   (symbol, date, open, high, low, close, volume, source, ingested_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (symbol, date, open_price, high, low, close, volume, source, ingested_at or datetime.utcnow().isoformat())
+            )
+            conn.commit()
+            return 1
+        except Exception as e:
+            logger.error(f"Error storing OHLC for {symbol} on {date}: {e}")
+            return 0
 
 
 def get_daily_ohlc(
@@ -164,32 +253,19 @@ def get_daily_ohlc(
     date: Optional[str] = None
 ) -> Optional[dict[str, Any]]:
     """Get daily OHLC for symbol and date."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         if date:
             cur = conn.execute(
-                "SELECT * FROM stock_history WHERE symbol=? AND date=?",
+                "SELECT symbol, date, open, high, low, close, volume FROM stock_history WHERE symbol=? AND date=?",
                 (symbol, date)
             )
         else:
             cur = conn.execute(
-                "SELECT * FROM stock_history WHERE symbol=? ORDER BY date DESC LIMIT 1",
+                "SELECT symbol, date, open, high, low, close, volume FROM stock_history WHERE symbol=? ORDER BY date DESC LIMIT 1",
                 (symbol,)
             )
         row = cur.fetchone()
-        if row:
-            return {
-                "symbol": row[0],
-                "date": row[1],
-                "open": row[2],
-                "high": row[3],
-                "low": row[4],
-                "close": row[5],
-                "volume": row[6],
-            }
-        return None
-    finally:
-        conn.close()
+        return dict(row) if row else None
 
 
 def log_ingestion(
@@ -199,20 +275,18 @@ def log_ingestion(
     records_ingested: int = 0,
     date_range_start: Optional[str] = None,
     date_range_end: Optional[str] = None,
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    created_at: Optional[str] = None
 ):
     """Log ingestion attempt."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         conn.execute(
             """INSERT INTO ingestion_log 
                (symbol, date_range_start, date_range_end, status, records_ingested, error_message, created_at)
                VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (symbol, date_range_start, date_range_end, status, records_ingested, error_message, datetime.utcnow().isoformat())
+            (symbol, date_range_start, date_range_end, status, records_ingested, error_message, created_at or datetime.utcnow().isoformat())
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
 def store_signal(
@@ -222,33 +296,66 @@ def store_signal(
     signal_type: str,
     metrics: dict[str, Any],
     severity: str,
-    bar_id: Optional[str] = None
+    bar_id: Optional[str] = None,
+    created_at: Optional[str] = None
 ) -> Optional[int]:
     """Store signal. Returns signal_id if inserted, None if duplicate."""
     import json
-    conn = connect(db_path)
-    try:
-        cur = conn.execute(
-            """INSERT INTO signals (symbol, datetime, signal_type, metrics_json, severity, created_at, bar_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (symbol, datetime_str, signal_type, json.dumps(metrics), severity, datetime.utcnow().isoformat(), bar_id)
-        )
-        conn.commit()
-        return cur.lastrowid
-    except sqlite3.IntegrityError:
-        # Duplicate signal
-        return None
-    except Exception as e:
-        logger.error(f"Error storing signal: {e}")
-        return None
-    finally:
-        conn.close()
+    with db(db_path) as conn:
+        try:
+            cur = conn.execute(
+                """INSERT INTO signals (symbol, datetime, signal_type, metrics_json, severity, created_at, bar_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (symbol, datetime_str, signal_type, json.dumps(metrics), severity, created_at or datetime.utcnow().isoformat(), bar_id)
+            )
+            conn.commit()
+            return cur.lastrowid
+        except sqlite3.IntegrityError:
+            # Duplicate signal
+            return None
+        except Exception as e:
+            logger.error(f"Error storing signal: {e}")
+            return None
+
+
+def store_signals_batch(
+    db_path: str,
+    symbol: str,
+    datetime_str: str,
+    signals: list["Signal"],
+    created_at: Optional[str] = None
+) -> list[Optional[int]]:
+    """
+    Store a bar's signals (as returned by detect_signals) in one transaction.
+    
+    Returns:
+        signal_id per signal, None where the signal was a duplicate
+    """
+    import json
+    if not signals:
+        return []
+    created_at = created_at or datetime.utcnow().isoformat()
+    with db(db_path) as conn:
+        try:
+            signal_ids = []
+            for signal in signals:
+                cur = conn.execute(
+                    """INSERT OR IGNORE INTO signals (symbol, datetime, signal_type, metrics_json, severity, created_at, bar_id)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (symbol, datetime_str, signal.signal_type, json.dumps(signal.metrics),
+                     signal.severity, created_at, signal.bar_id)
+                )
+                signal_ids.append(cur.lastrowid if cur.rowcount else None)
+            conn.commit()
+            return signal_ids
+        except Exception as e:
+            logger.error(f"Error storing signals for {symbol}: {e}")
+            return [None] * len(signals)
 
 
 def get_last_alert(db_path: str, symbol: str) -> Optional[dict[str, Any]]:
     """Get last alert info for symbol."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         cur = conn.execute(
             "SELECT * FROM alert_log WHERE symbol=?",
             (symbol,)
@@ -263,8 +370,6 @@ def get_last_alert(db_path: str, symbol: str) -> Optional[dict[str, Any]]:
                 "last_alert_severity": row[4],
             }
         return None
-    finally:
-        conn.close()
 
 
 def update_alert_log(
@@ -272,20 +377,18 @@ def update_alert_log(
     symbol: str,
     price: float,
     direction: str,
-    severity: str
+    severity: str,
+    alert_at: Optional[str] = None
 ):
     """Update alert log."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         conn.execute(
             """INSERT OR REPLACE INTO alert_log 
                (symbol, last_alert_at, last_alert_price, last_alert_direction, last_alert_severity)
                VALUES (?, ?, ?, ?, ?)""",
-            (symbol, datetime.utcnow().isoformat(), price, direction, severity)
+            (symbol, alert_at or datetime.utcnow().isoformat(), price, direction, severity)
         )
         conn.commit()
-    finally:
-        conn.close()
 
 
 def store_news_item(
@@ -294,30 +397,42 @@ def store_news_item(
     url: str,
     published_at: Optional[str],
     source: Optional[str],
-    query: Optional[str],
-    url_hash: str
+    query: Optional[str]
 ) -> int:
-    """Store news item. Returns news_id."""
-    conn = connect(db_path)
-    try:
-        cur = conn.execute(
-            """INSERT OR IGNORE INTO news_items 
-               (published_at, title, source, url, query, hash)
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (published_at, title, source, url, query, url_hash)
-        )
-        conn.commit()
-        if cur.lastrowid:
-            return cur.lastrowid
-        # Already exists, get ID
-        cur = conn.execute("SELECT id FROM news_items WHERE hash=?", (url_hash,))
-        row = cur.fetchone()
-        return row[0] if row else 0
-    except Exception as e:
-        logger.error(f"Error storing news item: {e}")
-        return 0
-    finally:
-        conn.close()
+    """Store news item, deduplicated by URL. Returns news_id."""
+    with db(db_path) as conn:
+        try:
+            if SUPPORTS_RETURNING:
+                # The no-op update on conflict makes RETURNING yield the existing id,
+                # so both new and duplicate items take a single round-trip
+                cur = conn.execute(
+                    """INSERT INTO news_items 
+                       (published_at, title, source, url, query)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET url=excluded.url
+                       RETURNING id""",
+                    (published_at, title, source, url, query)
+                )
+                row = cur.fetchone()
+                conn.commit()
+                return row[0] if row else 0
+            else:
+                cur = conn.execute(
+                    """INSERT OR IGNORE INTO news_items 
+                       (published_at, title, source, url, query)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (published_at, title, source, url, query)
+                )
+                conn.commit()
+                if cur.rowcount:
+                    return cur.lastrowid
+            # Already exists, get ID
+            cur = conn.execute("SELECT id FROM news_items WHERE url=?", (url,))
+            row = cur.fetchone()
+            return row[0] if row else 0
+        except Exception as e:
+            logger.error(f"Error storing news item: {e}")
+            return 0
 
 
 def link_signal_news(
@@ -327,18 +442,16 @@ def link_signal_news(
     relevance_label: str
 ):
     """Link signal to news item."""
-    conn = connect(db_path)
-    try:
-        conn.execute(
-            """INSERT OR IGNORE INTO signal_news_links (signal_id, news_id, relevance_label)
-               VALUES (?, ?, ?)""",
-            (signal_id, news_id, relevance_label)
-        )
-        conn.commit()
-    except Exception as e:
-        logger.error(f"Error linking signal-news: {e}")
-    finally:
-        conn.close()
+    with db(db_path) as conn:
+        try:
+            conn.execute(
+                """INSERT OR IGNORE INTO signal_news_links (signal_id, news_id, relevance_label)
+                   VALUES (?, ?, ?)""",
+                (signal_id, news_id, relevance_label)
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error linking signal-news: {e}")
 
 
 def get_signals_with_news(
@@ -347,58 +460,57 @@ def get_signals_with_news(
 ) -> list[dict[str, Any]]:
     """Get signals with linked news."""
     import json
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         if since:
             cur = conn.execute(
-                """SELECT s.id, s.symbol, s.datetime, s.signal_type, s.metrics_json, s.severity,
-                          GROUP_CONCAT(n.title || '|' || n.url || '|' || snl.relevance_label, '|||') as news
-                   FROM signals s
-                   LEFT JOIN signal_news_links snl ON s.id = snl.signal_id
-                   LEFT JOIN news_items n ON snl.news_id = n.id
-                   WHERE s.datetime >= ?
-                   GROUP BY s.id
-                   ORDER BY s.datetime DESC""",
+                """SELECT id, symbol, datetime, signal_type, metrics_json, severity
+                   FROM signals
+                   WHERE datetime >= ?
+                   ORDER BY datetime DESC""",
                 (since,)
             )
         else:
             cur = conn.execute(
-                """SELECT s.id, s.symbol, s.datetime, s.signal_type, s.metrics_json, s.severity,
-                          GROUP_CONCAT(n.title || '|' || n.url || '|' || snl.relevance_label, '|||') as news
-                   FROM signals s
-                   LEFT JOIN signal_news_links snl ON s.id = snl.signal_id
-                   LEFT JOIN news_items n ON snl.news_id = n.id
-                   GROUP BY s.id
-                   ORDER BY s.datetime DESC
+                """SELECT id, symbol, datetime, signal_type, metrics_json, severity
+                   FROM signals
+                   ORDER BY datetime DESC
                    LIMIT 50""",
             )
         
         results = []
-        for row in cur.fetchall():
-            news_data = []
-            if row[6]:  # news column
-                for news_str in row[6].split("|||"):
-                    parts = news_str.split("|")
-                    if len(parts) >= 3:
-                        news_data.append({
-                            "title": parts[0],
-                            "url": parts[1],
-                            "relevance": parts[2]
-                        })
-            
+        news_by_signal: dict[int, list[dict[str, Any]]] = {}
+        for row in cur:
+            news_data = news_by_signal.setdefault(row["id"], [])
             results.append({
-                "id": row[0],
-                "symbol": row[1],
-                "datetime": row[2],
-                "signal_type": row[3],
-                "metrics": json.loads(row[4]),
-                "severity": row[5],
+                "id": row["id"],
+                "symbol": row["symbol"],
+                "datetime": row["datetime"],
+                "signal_type": row["signal_type"],
+                "metrics": json.loads(row["metrics_json"]),
+                "severity": row["severity"],
                 "news": news_data
             })
         
+        # Attach linked news for all signals, batching the IN list
+        signal_ids = list(news_by_signal)
+        for start in range(0, len(signal_ids), IN_CLAUSE_BATCH_SIZE):
+            batch = signal_ids[start:start + IN_CLAUSE_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            cur = conn.execute(
+                f"""SELECT snl.signal_id, n.title, n.url, snl.relevance_label
+                    FROM signal_news_links snl
+                    JOIN news_items n ON snl.news_id = n.id
+                    WHERE snl.signal_id IN ({placeholders})""",
+                batch
+            )
+            for row in cur:
+                news_by_signal[row["signal_id"]].append({
+                    "title": row["title"],
+                    "url": row["url"],
+                    "relevance": row["relevance_label"]
+                })
+        
         return results
-    finally:
-        conn.close()
 
 
 def link_ohlc_news(
@@ -409,19 +521,17 @@ def link_ohlc_news(
     relevance_label: str = "historical"
 ):
     """Link news item to historical OHLC record."""
-    conn = connect(db_path)
-    try:
-        conn.execute(
-            """INSERT OR IGNORE INTO ohlc_news_links 
-               (symbol, date, news_id, relevance_label, created_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (symbol, date, news_id, relevance_label, datetime.utcnow().isoformat())
-        )
-        conn.commit()
-    except Exception as e:
-        logger.error(f"Error linking OHLC-news: {e}")
-    finally:
-        conn.close()
+    with db(db_path) as conn:
+        try:
+            conn.execute(
+                """INSERT OR IGNORE INTO ohlc_news_links 
+                   (symbol, date, news_id, relevance_label, created_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (symbol, date, news_id, relevance_label, datetime.utcnow().isoformat())
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error linking OHLC-news: {e}")
 
 
 def get_ohlc_with_news(
@@ -430,8 +540,7 @@ def get_ohlc_with_news(
     min_change_pct: Optional[float] = None
 ) -> list[dict[str, Any]]:
     """Get OHLC records with linked news. Optionally filter by symbol and min change %."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         query = """
             SELECT o.symbol, o.date, o.open, o.close, 
                    ABS((o.close - o.open) / o.open * 100) as change_pct,
@@ -481,23 +590,19 @@ def get_ohlc_with_news(
             })
         
         return results
-    finally:
-        conn.close()
 
 
 def clear_top_gainers(db_path: str) -> bool:
     """Clear all top gainers from database (for fresh scrape)."""
-    conn = connect(db_path)
-    try:
-        conn.execute("DELETE FROM top_gainers")
-        conn.commit()
-        logger.info("Cleared all top gainers from database")
-        return True
-    except Exception as e:
-        logger.error(f"Error clearing top gainers: {e}")
-        return False
-    finally:
-        conn.close()
+    with db(db_path) as conn:
+        try:
+            conn.execute("DELETE FROM top_gainers")
+            conn.commit()
+            logger.info("Cleared all top gainers from database")
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing top gainers: {e}")
+            return False
 
 
 def store_top_gainer(
@@ -509,29 +614,28 @@ def store_top_gainer(
     news_summary: Optional[str] = None
 ) -> int:
     """Store top gainer with news summary."""
-    conn = connect(db_path)
-    try:
-        cur = conn.execute(
-            """INSERT INTO top_gainers 
-               (symbol, start_price, current_price, change_pct, news_summary, detected_at, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                symbol,
-                start_price,
-                current_price,
-                change_pct,
-                news_summary,
-                datetime.utcnow().isoformat(),
-                datetime.utcnow().isoformat()
+    with db(db_path) as conn:
+        try:
+            now = datetime.utcnow().isoformat()
+            cur = conn.execute(
+                """INSERT INTO top_gainers 
+                   (symbol, start_price, current_price, change_pct, news_summary, detected_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    symbol,
+                    start_price,
+                    current_price,
+                    change_pct,
+                    news_summary,
+                    now,
+                    now
+                )
             )
-        )
-        conn.commit()
-        return cur.lastrowid
-    except Exception as e:
-        logger.error(f"Error storing top gainer: {e}")
-        return 0
-    finally:
-        conn.close()
+            conn.commit()
+            return cur.lastrowid
+        except Exception as e:
+            logger.error(f"Error storing top gainer: {e}")
+            return 0
 
 
 def store_top_gainers_batch(
@@ -539,36 +643,34 @@ def store_top_gainers_batch(
     gainers: list[dict[str, Any]]
 ) -> int:
     """Store multiple top gainers in a batch. Returns count of stored records."""
-    conn = connect(db_path)
-    try:
-        count = 0
-        now = datetime.utcnow().isoformat()
-        for gainer in gainers:
-            try:
-                conn.execute(
-                    """INSERT INTO top_gainers 
-                       (symbol, start_price, current_price, change_pct, news_summary, detected_at, created_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        gainer["symbol"],
-                        gainer["start_price"],
-                        gainer["current_price"],
-                        gainer["change_pct"],
-                        gainer.get("news_summary"),
-                        now,
-                        now
+    with db(db_path) as conn:
+        try:
+            count = 0
+            now = datetime.utcnow().isoformat()
+            for gainer in gainers:
+                try:
+                    conn.execute(
+                        """INSERT INTO top_gainers 
+                           (symbol, start_price, current_price, change_pct, news_summary, detected_at, created_at)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        (
+                            gainer["symbol"],
+                            gainer["start_price"],
+                            gainer["current_price"],
+                            gainer["change_pct"],
+                            gainer.get("news_summary"),
+                            now,
+                            now
+                        )
                     )
-                )
-                count += 1
-            except Exception as e:
-                logger.warning(f"Error storing gainer {gainer.get('symbol')}: {e}")
-        conn.commit()
-        return count
-    except Exception as e:
-        logger.error(f"Error in batch store: {e}")
-        return 0
-    finally:
-        conn.close()
+                    count += 1
+                except Exception as e:
+                    logger.warning(f"Error storing gainer {gainer.get('symbol')}: {e}")
+            conn.commit()
+            return count
+        except Exception as e:
+            logger.error(f"Error in batch store: {e}")
+            return 0
 
 
 def get_top_gainers(
@@ -577,8 +679,7 @@ def get_top_gainers(
     min_change_pct: Optional[float] = None
 ) -> list[dict[str, Any]]:
     """Get top gainers from database."""
-    conn = connect(db_path)
-    try:
+    with db(db_path) as conn:
         query = "SELECT * FROM top_gainers WHERE 1=1"
         params = []
         
@@ -605,5 +706,3 @@ def get_top_gainers(
             })
         
         return results
-    finally:
-        conn.close()
@@ -2,11 +2,22 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.mime.application import MIMEApplication
+from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _build_message(smtp_user: str, to_email: str, subject: str, body: str) -> MIMEText:
+    """Build a plain-text alert message."""
+    msg = MIMEText(body, "plain")
+    msg["From"] = smtp_user
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    return msg
+
+
 def send_alert_email(
     smtp_host: str,
     smtp_port: int,
@@ -17,6 +28,40 @@ def send_alert_email(
     body: str
 ) -> bool:
     """Send alert email."""
+    try:
+        msg = _build_message(smtp_user, to_email, subject, body)
+        
+        with smtplib.SMTP(smtp_host, smtp_port) as server:
+            server.starttls()
+            server.login(smtp_user, smtp_password)
+            server.send_message(msg)
+        
+        logger.info(f"Alert email sent to {to_email}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send email: {e}")
+        return False
+
+
+def send_email_with_attachments(
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+    to_email: str,
+    subject: str,
+    body: str,
+    attachments: list[str]
+) -> bool:
+    """
+    Send an email with file attachments.
+    
+    Args:
+        attachments: Paths of files to attach
+    
+    Returns:
+        True if the email was sent
+    """
     try:
         msg = MIMEMultipart()
         msg["From"] = smtp_user
@@ -24,14 +69,55 @@ def send_alert_email(
         msg["Subject"] = subject
         
         msg.attach(MIMEText(body, "plain"))
+        for path in attachments:
+            part = MIMEApplication(Path(path).read_bytes(), Name=Path(path).name)
+            part["Content-Disposition"] = f'attachment; filename="{Path(path).name}"'
+            msg.attach(part)
         
         with smtplib.SMTP(smtp_host, smtp_port) as server:
             server.starttls()
             server.login(smtp_user, smtp_password)
             server.send_message(msg)
         
-        logger.info(f"Alert email sent to {to_email}")
+        logger.info(f"Email with {len(attachments)} attachment(s) sent to {to_email}")
         return True
     except Exception as e:
         logger.error(f"Failed to send email: {e}")
         return False
+
+
+def send_alert_emails_bulk(
+    smtp_host: str,
+    smtp_port: int,
+    smtp_user: str,
+    smtp_password: str,
+    messages: list[tuple[str, str, str]]
+) -> int:
+    """
+    Send several alert emails over a single SMTP session.
+    
+    Args:
+        messages: List of (to_email, subject, body) tuples
+    
+    Returns:
+        Number of emails sent successfully
+    """
+    if not messages:
+        return 0
+    
+    sent = 0
+    try:
+        with smtplib.SMTP(smtp_host, smtp_port) as server:
+            server.starttls()
+            server.login(smtp_user, smtp_password)
+            for to_email, subject, body in messages:
+                try:
+                    msg = _build_message(smtp_user, to_email, subject, body)
+                    server.sendmail(smtp_user, [to_email], msg.as_string())
+                    sent += 1
+                    logger.info(f"Alert email sent to {to_email}")
+                except smtplib.SMTPRecipientsRefused as e:
+                    logger.error(f"Failed to send email to {to_email}: {e}")
+    except Exception as e:
+        logger.error(f"Failed to send emails: {e}")
+    return sent
@@ -0,0 +1,40 @@
+"""Sliding-window max/min over a stream of bars."""
+from collections import deque
+import math
+
+
+class RollingMax:
+    """
+    Maximum of the last `window` values pushed, kept in a monotonic deque.
+
+    Each push is amortized O(1): values that can never be the maximum again
+    are dropped from the back, expired values from the front.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._deque: deque[tuple[int, float]] = deque()
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+    def push(self, index: int, value: float):
+        """Add the value at stream position `index` (positions must increase). NaN is skipped."""
+        dq = self._deque
+        if not math.isnan(value):
+            while dq and self._dominates(value, dq[-1][1]):
+                dq.pop()
+            dq.append((index, value))
+        while dq and dq[0][0] <= index - self.window:
+            dq.popleft()
+
+    def peek(self) -> float:
+        """Current window extreme, or NaN if the window holds no values."""
+        return self._deque[0][1] if self._deque else math.nan
+
+
+class RollingMin(RollingMax):
+    """Minimum of the last `window` values pushed."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
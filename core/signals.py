@@ -1,113 +1,197 @@
 """Deterministic signal detection."""
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Optional, Union
 import math
 import logging
 
+import numpy as np
+
+from core.signals_nb import compute_signal_metrics
+
 logger = logging.getLogger(__name__)
 
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _column(bars: list[dict[str, Any]], field: str) -> np.ndarray:
+    """One bar field as float64; missing or unparseable values become NaN."""
+    try:
+        # Twelve Data sends numeric strings; None converts to NaN
+        return np.array([b.get(field) for b in bars], dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (_safe_float(b.get(field), math.nan) for b in bars),
+            dtype=np.float64,
+            count=len(bars)
+        )
+
+
+class Signal(NamedTuple):
+    """A detected signal for the latest bar."""
+    signal_type: str
+    metrics: dict[str, Any]
+    severity: str
+    bar_id: str
+
+
+@dataclass
+class BarSeries:
+    """Bars stored column-wise, oldest to newest: one float64 array per OHLCV field."""
+    datetime: list[str]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.datetime)
+    
+    def __getitem__(self, rows: slice) -> "BarSeries":
+        """Slice of rows as a new BarSeries."""
+        return BarSeries(
+            datetime=self.datetime[rows],
+            **{field: getattr(self, field)[rows] for field in BAR_FIELDS}
+        )
+    
+    def append(self, other: "BarSeries") -> "BarSeries":
+        """New BarSeries with other's rows after this one's."""
+        return BarSeries(
+            datetime=self.datetime + other.datetime,
+            **{field: np.concatenate((getattr(self, field), getattr(other, field))) for field in BAR_FIELDS}
+        )
+    
+    def reversed(self) -> "BarSeries":
+        """Rows in reverse order, as contiguous copies."""
+        return BarSeries(
+            datetime=self.datetime[::-1],
+            **{field: getattr(self, field)[::-1].copy() for field in BAR_FIELDS}
+        )
+    
+    @classmethod
+    def from_bars(cls, bars: list[dict[str, Any]]) -> "BarSeries":
+        """Build from bar dicts, keeping their order."""
+        return cls(
+            datetime=[b.get("datetime", "") for b in bars],
+            **{field: _column(bars, field) for field in BAR_FIELDS}
+        )
+
 
 def detect_signals(
     symbol: str,
-    bars: list[dict[str, Any]],
+    bars: Union[BarSeries, list[dict[str, Any]]],
     day_open: float,
     move_pct: float,
     volume_spike_mult: float,
-    breakout_lookback: int
-) -> list[dict[str, Any]]:
+    breakout_lookback: int,
+    prior_high: Optional[float] = None,
+    prior_low: Optional[float] = None
+) -> list[Signal]:
     """
     Detect signals from intraday bars.
     
     Args:
         symbol: Stock symbol
-        bars: List of bars (oldest to newest)
+        bars: BarSeries or list of bars (oldest to newest)
         day_open: Today's opening price
         move_pct: Threshold for price move from open
         volume_spike_mult: Volume multiplier threshold
         breakout_lookback: Bars to look back for breakout
+        prior_high: Lookback high kept by the caller (e.g. a RollingMax), instead of rescanning
+        prior_low: Lookback low kept by the caller (e.g. a RollingMin), instead of rescanning
         
     Returns:
-        List of signal dictionaries
+        List of Signal tuples
     """
     if not bars or len(bars) < 2:
         return []
     
-    signals = []
-    latest = bars[-1]
-    latest_close = _safe_float(latest.get("close"))
-    latest_vol = _safe_float(latest.get("volume", 0), 0.0)
-    latest_dt = latest.get("datetime", "")
+    if not isinstance(bars, BarSeries):
+        bars = BarSeries.from_bars(bars)
+    latest_close = float(bars.close[-1])
+    latest_vol = 0.0 if math.isnan(bars.volume[-1]) else float(bars.volume[-1])
+    latest_dt = bars.datetime[-1]
     
     if math.isnan(latest_close) or day_open == 0:
         return []
     
+    pct_change_from_open, avg_vol, window_high, window_low = compute_signal_metrics(
+        bars.close, bars.high, bars.low, bars.volume,
+        float(day_open), breakout_lookback,
+        prior_high is None or prior_low is None
+    )
+    
+    pct_change_from_open = float(pct_change_from_open)
+    avg_vol = float(avg_vol)
+    if len(bars) < breakout_lookback + 1:
+        prior_high = prior_low = math.nan
+    elif prior_high is None or prior_low is None:
+        prior_high = float(window_high)
+        prior_low = float(window_low)
+    
+    # Cheap threshold tests first; most polls breach none of them
+    moved = abs(pct_change_from_open) >= move_pct
+    spiked = avg_vol > 0 and latest_vol >= volume_spike_mult * avg_vol
+    broke = (
+        not (math.isnan(prior_high) or math.isnan(prior_low))
+        and (latest_close > prior_high or latest_close < prior_low)
+    )
+    if not (moved or spiked or broke):
+        return []
+    
+    signals = []
+    
     # Signal 1: Price change from day open
-    pct_change_from_open = ((latest_close - day_open) / day_open) * 100.0
-    if abs(pct_change_from_open) >= move_pct:
-        signals.append({
-            "signal_type": "move_from_open",
-            "metrics": {
+    if moved:
+        signals.append(Signal(
+            signal_type="move_from_open",
+            metrics={
                 "day_open": day_open,
                 "latest_close": latest_close,
                 "pct_change": pct_change_from_open,
                 "direction": "up" if pct_change_from_open > 0 else "down"
             },
-            "severity": "high" if abs(pct_change_from_open) >= move_pct * 2 else "medium",
-            "bar_id": latest_dt
-        })
-    
-    # Signal 2: Volume spike
-    if len(bars) >= 21:
-        window = bars[-21:-1]  # Last 20 bars excluding latest
-        vols = [_safe_float(b.get("volume", 0), 0.0) for b in window]
-        avg_vol = sum(vols) / len(vols) if vols else 0
-        
-        if avg_vol > 0 and latest_vol >= volume_spike_mult * avg_vol:
-            signals.append({
-                "signal_type": "volume_spike",
-                "metrics": {
-                    "latest_volume": latest_vol,
-                    "avg_volume": avg_vol,
-                    "multiplier": latest_vol / avg_vol
-                },
-                "severity": "medium",
-                "bar_id": latest_dt
-            })
+            severity="high" if abs(pct_change_from_open) >= move_pct * 2 else "medium",
+            bar_id=latest_dt
+        ))
+    
+    # Signal 2: Volume spike (avg of the last 20 bars excluding latest)
+    if spiked:
+        signals.append(Signal(
+            signal_type="volume_spike",
+            metrics={
+                "latest_volume": latest_vol,
+                "avg_volume": avg_vol,
+                "multiplier": latest_vol / avg_vol
+            },
+            severity="medium",
+            bar_id=latest_dt
+        ))
     
     # Signal 3: Breakout/Breakdown
-    if len(bars) >= breakout_lookback + 1:
-        look = bars[-(breakout_lookback+1):-1]
-        highs = [_safe_float(b.get("high")) for b in look]
-        lows = [_safe_float(b.get("low")) for b in look]
-        
-        valid_highs = [h for h in highs if not math.isnan(h)]
-        valid_lows = [l for l in lows if not math.isnan(l)]
-        
-        if valid_highs and valid_lows:
-            prior_high = max(valid_highs)
-            prior_low = min(valid_lows)
-            
-            if latest_close > prior_high:
-                signals.append({
-                    "signal_type": "breakout",
-                    "metrics": {
-                        "latest_close": latest_close,
-                        "prior_high": prior_high,
-                        "breakout_amount": latest_close - prior_high
-                    },
-                    "severity": "high",
-                    "bar_id": latest_dt
-                })
-            elif latest_close < prior_low:
-                signals.append({
-                    "signal_type": "breakdown",
-                    "metrics": {
-                        "latest_close": latest_close,
-                        "prior_low": prior_low,
-                        "breakdown_amount": latest_close - prior_low
-                    },
-                    "severity": "high",
-                    "bar_id": latest_dt
-                })
+    if broke:
+        if latest_close > prior_high:
+            signals.append(Signal(
+                signal_type="breakout",
+                metrics={
+                    "latest_close": latest_close,
+                    "prior_high": prior_high,
+                    "breakout_amount": latest_close - prior_high
+                },
+                severity="high",
+                bar_id=latest_dt
+            ))
+        else:
+            signals.append(Signal(
+                signal_type="breakdown",
+                metrics={
+                    "latest_close": latest_close,
+                    "prior_low": prior_low,
+                    "breakdown_amount": latest_close - prior_low
+                },
+                severity="high",
+                bar_id=latest_dt
+            ))
     
     return signals
 
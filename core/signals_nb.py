@@ -0,0 +1,54 @@
+"""Numeric kernel for signal detection, compiled with numba when it is installed."""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _jit(fn):
+    """Compile with numba (cached on disk) if available; otherwise run as plain NumPy."""
+    return njit(cache=True)(fn) if njit is not None else fn
+
+
+@_jit
+def compute_signal_metrics(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    day_open: float,
+    lookback: int,
+    compute_prior: bool
+):
+    """
+    Reduce bar arrays (oldest to newest) to the scalars detect_signals tests.
+
+    Returns:
+        (pct_change, avg_vol, prior_high, prior_low). avg_vol is NaN with fewer
+        than 21 bars; prior_high/prior_low are NaN with fewer than lookback + 1
+        bars, when the window holds no values, or when compute_prior is False.
+    """
+    n = close.shape[0]
+    pct_change = (close[n - 1] - day_open) / day_open * 100.0
+
+    # Average volume of the 20 bars before the latest
+    avg_vol = np.nan
+    if n >= 21:
+        vol_win = volume[n - 21:n - 1]
+        avg_vol = 0.0 if np.isnan(vol_win).all() else np.nanmean(vol_win)
+
+    # High/low of the lookback bars before the latest; nanmax/nanmin skip
+    # missing bars on the slice views directly, so no filtered copies are made
+    prior_high = np.nan
+    prior_low = np.nan
+    if compute_prior and n >= lookback + 1:
+        high_win = high[n - lookback - 1:n - 1]
+        low_win = low[n - lookback - 1:n - 1]
+        if not np.isnan(high_win).all():
+            prior_high = np.nanmax(high_win)
+        if not np.isnan(low_win).all():
+            prior_low = np.nanmin(low_win)
+
+    return pct_change, avg_vol, prior_high, prior_low
@@ -1,25 +1,146 @@
 """Twelve Data API tools."""
+import asyncio
+import importlib.util
+import io
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Any, Optional
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit
+from datetime import date, datetime, timedelta
+from email.utils import parsedate
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# httpx only negotiates HTTP/2 when the h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+from core.signals import BarSeries
 
 logger = logging.getLogger(__name__)
 
 TWELVE_BASE = "https://api.twelvedata.com"
 
+# Max Twelve Data requests in flight at once when symbols are fetched in parallel
+TWELVE_DATA_MAX_CONCURRENT = 8
+_twelve_data_slots = threading.BoundedSemaphore(TWELVE_DATA_MAX_CONCURRENT)
 
-def fetch_time_series(
+# Twelve Data credits per minute (free plan: 8); each time_series request costs one
+TWELVE_DATA_CREDITS_PER_MINUTE = 8
+
+RSS_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `capacity` tokens, refilled evenly over `period` seconds.
+    
+    acquire() takes one token, sleeping until one is available.
+    """
+    
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_twelve_data_credits = TokenBucket(TWELVE_DATA_CREDITS_PER_MINUTE)
+
+# Max concurrent RSS requests to any one host (be polite to shared hosts)
+RSS_MAX_PER_HOST = 2
+_rss_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_rss_host_slots_lock = threading.Lock()
+
+# Query parameters that only track the click, not the article
+TRACKING_QUERY_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "cmpid", "ref"})
+
+# Minimum spacing between outgoing Google News requests (be polite)
+GOOGLE_NEWS_MIN_INTERVAL = 0.5
+_google_news_lock = threading.Lock()
+_google_news_last_call = 0.0
+
+
+# Retry policy for outgoing HTTP requests (requests sessions and the httpx RSS client)
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def make_session(pool_size: int = 16) -> requests.Session:
+    """
+    Create a Session whose connection pool can serve `pool_size` threads at once.
+    
+    Connection errors, 429 and 5xx responses are retried with backoff
+    (honouring Retry-After).
+    """
+    session = requests.Session()
+    retry = Retry(total=HTTP_RETRY_TOTAL, backoff_factor=HTTP_RETRY_BACKOFF, status_forcelist=HTTP_RETRY_STATUSES)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared keep-alive session for all outgoing requests in this process
+_SESSION = make_session(pool_size=32)
+
+
+def _fetch_time_series_values(
     api_key: str,
     symbol: str,
     interval: str,
     outputsize: int,
-    retry_count: int = 3
+    retry_count: int = 3,
+    session: Optional[requests.Session] = None
 ) -> list[dict[str, Any]]:
     """
-    Fetch time series data from Twelve Data.
-    Returns bars ordered oldest to newest.
+    Fetch time series bars from Twelve Data in the order the API sends them.
+    
+    Requests go through the shared module session unless one is passed, and
+    wait for a credit so bursts stay within TWELVE_DATA_CREDITS_PER_MINUTE.
+    Network errors and HTTP 429/5xx are retried by the session; retry_count
+    covers rate-limit errors that Twelve Data reports inside a 200 response.
     """
+    http = session or _SESSION
     url = f"{TWELVE_BASE}/time_series"
     params = {
         "symbol": symbol,
@@ -30,9 +151,11 @@ def fetch_time_series(
     
     for attempt in range(retry_count):
         try:
-            r = requests.get(url, params=params, timeout=30)
+            _twelve_data_credits.acquire()
+            with _twelve_data_slots:
+                r = http.get(url, params=params, timeout=30)
             r.raise_for_status()
-            data = r.json()
+            data = orjson.loads(r.content) if orjson else r.json()
             
             if "values" not in data:
                 error_msg = data.get("message", "Unknown error")
@@ -44,22 +167,9 @@ def fetch_time_series(
                 logger.warning(f"API error for {symbol}: {error_msg}")
                 return []
             
-            vals = data["values"]
-            if not vals:
-                return []
-            
-            # Normalize to oldest->newest
-            if len(vals) >= 2 and vals[0]["datetime"] > vals[-1]["datetime"]:
-                vals = list(reversed(vals))
-            
-            return vals
+            return data["values"] or []
             
         except requests.exceptions.RequestException as e:
-            if attempt < retry_count - 1:
-                wait_time = (attempt + 1) * 2
-                logger.warning(f"Request error for {symbol}, retrying in {wait_time}s...")
-                time.sleep(wait_time)
-                continue
             logger.error(f"Network error for {symbol}: {e}")
             return []
         except Exception as e:
@@ -69,60 +179,235 @@ def fetch_time_series(
     return []
 
 
-def fetch_rss_feed(rss_url: str, limit: int = 10) -> list[dict[str, Any]]:
-    """Fetch news from an RSS feed URL."""
-    import xml.etree.ElementTree as ET
+def _newest_first(vals: list[dict[str, Any]]) -> bool:
+    """Whether Twelve Data returned the bars newest first."""
+    return len(vals) >= 2 and vals[0]["datetime"] > vals[-1]["datetime"]
+
+
+def fetch_time_series(
+    api_key: str,
+    symbol: str,
+    interval: str,
+    outputsize: int,
+    retry_count: int = 3,
+    session: Optional[requests.Session] = None
+) -> list[dict[str, Any]]:
+    """
+    Fetch time series data from Twelve Data.
+    Returns bars ordered oldest to newest.
+    """
+    vals = _fetch_time_series_values(api_key, symbol, interval, outputsize, retry_count, session)
+    # Normalize to oldest->newest
+    return vals[::-1] if _newest_first(vals) else vals
+
+
+def _rss_host_slot(url: str) -> threading.BoundedSemaphore:
+    """Get the semaphore limiting concurrent requests to url's host."""
+    host = urlparse(url).netloc
+    with _rss_host_slots_lock:
+        slot = _rss_host_slots.get(host)
+        if slot is None:
+            slot = _rss_host_slots[host] = threading.BoundedSemaphore(RSS_MAX_PER_HOST)
+    return slot
+
+
+def fetch_bar_series(
+    api_key: str,
+    symbol: str,
+    interval: str,
+    outputsize: int,
+    session: Optional[requests.Session] = None
+) -> Optional[BarSeries]:
+    """Fetch time series data from Twelve Data as a column-wise BarSeries (None if no data)."""
+    vals = _fetch_time_series_values(api_key, symbol, interval, outputsize, session=session)
+    if not vals:
+        return None
+    # Build columns in API order, then flip the arrays instead of the dict list
+    bars = BarSeries.from_bars(vals)
+    return bars.reversed() if _newest_first(vals) else bars
+
+
+def _iter_rss_items(content: bytes, limit: int):
+    """
+    Yield the first `limit` <item> elements of an RSS document.
     
-    try:
-        r = requests.get(rss_url, timeout=20, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        })
-        r.raise_for_status()
-        root = ET.fromstring(r.text)
+    With lxml the document is stream-parsed and parsing stops once `limit`
+    items have been read; each item is cleared after the caller is done with it.
+    """
+    if limit <= 0:
+        return
+    if lxml_etree is None:
+        import xml.etree.ElementTree as ET
+        yield from ET.fromstring(content).findall(".//item")[:limit]
+        return
+    
+    count = 0
+    for _, item in lxml_etree.iterparse(io.BytesIO(content), tag="item", resolve_entities=False):
+        yield item
+        item.clear()
+        count += 1
+        if count >= limit:
+            break
+
+
+def _parse_rss_feed(content: bytes, limit: int, rss_url: str) -> list[dict[str, Any]]:
+    """Extract up to `limit` news items from an RSS document."""
+    items = []
+    for item in _iter_rss_items(content, limit):
+        title = (item.findtext("title") or "").strip()
+        link = (item.findtext("link") or "").strip()
+        pub_date = (item.findtext("pubDate") or "").strip()
+        description = (item.findtext("description") or "").strip()
+        source = (item.findtext("source") or "").strip()
         
-        items = []
-        for item in root.findall(".//item")[:limit]:
-            title = (item.findtext("title") or "").strip()
-            link = (item.findtext("link") or "").strip()
-            pub_date = (item.findtext("pubDate") or "").strip()
-            description = (item.findtext("description") or "").strip()
-            source = (item.findtext("source") or "").strip()
-            
-            # Try to get source from different RSS formats
-            if not source:
-                source_elem = item.find("source")
-                if source_elem is not None:
-                    source = source_elem.text or source_elem.get("url", "")
-            
-            if title and link:
-                items.append({
-                    "title": title,
-                    "url": link,
-                    "published_at": pub_date,
-                    "description": description,
-                    "source": source or rss_url
-                })
+        # Try to get source from different RSS formats
+        if not source:
+            source_elem = item.find("source")
+            if source_elem is not None:
+                source = source_elem.text or source_elem.get("url", "")
         
-        return items
+        if title and link:
+            items.append({
+                "title": title,
+                "url": link,
+                "published_at": pub_date,
+                "description": description,
+                "source": source or rss_url
+            })
+    
+    return items
+
+
+def fetch_rss_feed(
+    rss_url: str,
+    limit: int = 10,
+    timeout: float = 20,
+    session: Optional[requests.Session] = None
+) -> list[dict[str, Any]]:
+    """Fetch news from an RSS feed URL."""
+    http = session or _SESSION
+    try:
+        with _rss_host_slot(rss_url):
+            r = http.get(rss_url, timeout=timeout, headers=RSS_HEADERS)
+        r.raise_for_status()
+        return _parse_rss_feed(r.content, limit, rss_url)
     except Exception as e:
         logger.warning(f"Error fetching RSS feed '{rss_url}': {e}")
         return []
 
 
+async def _get_with_retries(client: "httpx.AsyncClient", url: str) -> "httpx.Response":
+    """
+    GET with the same policy as make_session's Retry: transport errors, 429
+    and 5xx are retried HTTP_RETRY_TOTAL times with exponential backoff,
+    honouring a numeric Retry-After.
+    """
+    for attempt in range(HTTP_RETRY_TOTAL + 1):
+        delay = HTTP_RETRY_BACKOFF * 2 ** attempt
+        try:
+            r = await client.get(url)
+        except httpx.TransportError:
+            if attempt == HTTP_RETRY_TOTAL:
+                raise
+        else:
+            if r.status_code not in HTTP_RETRY_STATUSES or attempt == HTTP_RETRY_TOTAL:
+                return r
+            retry_after = r.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = int(retry_after)
+        await asyncio.sleep(delay)
+
+
+async def _fetch_rss_feeds_async(
+    feeds: list[tuple[str, int]],
+    timeout: float
+) -> list[list[dict[str, Any]]]:
+    """Fetch feeds over one httpx client, multiplexed per host when HTTP/2 is available."""
+    loop = asyncio.get_running_loop()
+    host_slots: dict[str, asyncio.Semaphore] = {}
+    limits = httpx.Limits(max_connections=64)
+    
+    async with httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=timeout,
+        limits=limits,
+        headers=RSS_HEADERS,
+        follow_redirects=True
+    ) as client:
+        async def fetch(rss_url: str, limit: int) -> list[dict[str, Any]]:
+            slot = host_slots.setdefault(urlparse(rss_url).netloc, asyncio.Semaphore(RSS_MAX_PER_HOST))
+            try:
+                async with slot:
+                    r = await _get_with_retries(client, rss_url)
+                r.raise_for_status()
+                # Parse in a worker thread so the event loop keeps serving other feeds
+                return await loop.run_in_executor(None, _parse_rss_feed, r.content, limit, rss_url)
+            except Exception as e:
+                logger.warning(f"Error fetching RSS feed '{rss_url}': {e}")
+                return []
+        
+        return await asyncio.gather(*(fetch(rss_url, limit) for rss_url, limit in feeds))
+
+
+def _in_event_loop() -> bool:
+    """True if called from a thread with a running asyncio event loop (asyncio.run would fail)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def fetch_rss_feeds(
+    feeds: list[tuple[str, int]],
+    timeout: float = 20,
+    max_workers: int = 8
+) -> list[list[dict[str, Any]]]:
+    """
+    Fetch several RSS feeds concurrently.
+    
+    Uses a single httpx.AsyncClient (HTTP/2 when h2 is installed) if httpx is
+    available and the caller is not already inside an event loop, otherwise
+    a thread pool over fetch_rss_feed. Both paths send RSS_HEADERS and retry
+    like make_session.
+    
+    Args:
+        feeds: (rss_url, limit) pairs
+    
+    Returns:
+        One item list per feed, in the same order
+    """
+    if not feeds:
+        return []
+    if httpx is not None and not _in_event_loop():
+        return asyncio.run(_fetch_rss_feeds_async(feeds, timeout))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(lambda feed: fetch_rss_feed(feed[0], limit=feed[1], timeout=timeout), feeds))
+
+
+def _throttle_google_news():
+    """Wait until at least GOOGLE_NEWS_MIN_INTERVAL has passed since the last request."""
+    global _google_news_last_call
+    with _google_news_lock:
+        wait = GOOGLE_NEWS_MIN_INTERVAL - (time.monotonic() - _google_news_last_call)
+        if wait > 0:
+            time.sleep(wait)
+        _google_news_last_call = time.monotonic()
+
+
 def fetch_google_news(query: str, limit: int = 10) -> list[dict[str, Any]]:
     """Fetch news from Google News RSS (fallback method)."""
     from urllib.parse import quote_plus
-    import xml.etree.ElementTree as ET
     
     url = f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-GB&gl=GB&ceid=GB:en"
     
+    _throttle_google_news()
     try:
-        r = requests.get(url, timeout=20)
+        r = _SESSION.get(url, timeout=20)
         r.raise_for_status()
-        root = ET.fromstring(r.text)
         
         items = []
-        for item in root.findall(".//item")[:limit]:
+        for item in _iter_rss_items(r.content, limit):
             title = (item.findtext("title") or "").strip()
             link = (item.findtext("link") or "").strip()
             pub_date = (item.findtext("pubDate") or "").strip()
@@ -142,8 +427,9 @@ def fetch_google_news(query: str, limit: int = 10) -> list[dict[str, Any]]:
         return []
 
 
+@lru_cache(maxsize=1)
 def load_news_sources() -> dict[str, Any]:
-    """Load predefined news sources from JSON file."""
+    """Load predefined news sources from JSON file (read once per process; treat as read-only)."""
     import json
     from pathlib import Path
     
@@ -189,8 +475,9 @@ def load_news_sources() -> dict[str, Any]:
         }
 
 
+@lru_cache(maxsize=1)
 def load_company_names() -> dict[str, dict]:
-    """Load company name mappings from JSON file."""
+    """Load company name mappings from JSON file (read once per process; treat as read-only)."""
     import json
     from pathlib import Path
     
@@ -207,80 +494,165 @@ def load_company_names() -> dict[str, dict]:
         return {}
 
 
+@lru_cache(maxsize=512)
+def _symbol_match_terms(symbol: str) -> tuple[str, ...]:
+    """Symbol, company name and aliases to look for in news text, longest first."""
+    symbol_upper = symbol.upper()
+    company_info = load_company_names().get(symbol_upper, {})
+    terms = {symbol.replace(".L", "").upper(), symbol_upper}
+    if company_info.get("name"):
+        terms.add(company_info["name"])
+    terms.update(a for a in company_info.get("aliases", []) if a)
+    return tuple(sorted(terms, key=len, reverse=True))
+
+
+@lru_cache(maxsize=512)
+def _symbol_regex(symbol: str) -> "re.Pattern[str]":
+    """Compiled whole-word, case-insensitive alternation of a symbol's match terms."""
+    alternation = "|".join(re.escape(t) for t in _symbol_match_terms(symbol))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def _symbol_automaton(symbol: str) -> "ahocorasick.Automaton":
+    """Aho-Corasick automaton over a symbol's lowercased match terms."""
+    automaton = ahocorasick.Automaton()
+    for term in _symbol_match_terms(symbol):
+        automaton.add_word(term.lower(), len(term))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(text: str, i: int) -> bool:
+    return 0 <= i < len(text) and (text[i].isalnum() or text[i] == "_")
+
+
+def _automaton_match(symbol: str, text: str) -> bool:
+    """Whole-word match of any term in a single automaton pass over the lowercased text."""
+    text = text.lower()
+    for end, length in _symbol_automaton(symbol).iter(text):
+        if not _is_word_char(text, end - length) and not _is_word_char(text, end + 1):
+            return True
+    return False
+
+
 def matches_symbol(item: dict, symbol: str) -> bool:
     """Check if news item matches the stock symbol by company name."""
     if not symbol:
         return True
     
-    company_names = load_company_names()
-    symbol_upper = symbol.upper()
-    
-    # Get company name and aliases
-    company_info = company_names.get(symbol_upper, {})
-    company_name = company_info.get("name", "")
-    aliases = company_info.get("aliases", [])
-    
-    title = (item.get("title", "") or "").lower()
-    description = (item.get("description", "") or "").lower()
+    title = item.get("title", "") or ""
+    description = item.get("description", "") or ""
     text = f"{title} {description}"
     
-    # Check for symbol itself (some articles might mention it)
-    symbol_clean = symbol.replace(".L", "").upper()
-    if symbol_clean.lower() in text or symbol_upper.lower() in text:
-        return True
-    
-    # Check for company name
-    if company_name and company_name.lower() in text:
-        return True
-    
-    # Check for aliases
-    for alias in aliases:
-        if alias.lower() in text:
-            return True
-    
-    return False
+    # Symbol, company name or any alias appearing as a whole word
+    if ahocorasick is not None:
+        return _automaton_match(symbol, text)
+    return _symbol_regex(symbol).search(text) is not None
+
+
+@lru_cache(maxsize=64)
+def _date_window(target_date: str, days_before: int, days_after: int) -> tuple[date, date]:
+    """Inclusive (lower, upper) dates around a YYYY-MM-DD target."""
+    target = date.fromisoformat(target_date)
+    return target - timedelta(days=days_before), target + timedelta(days=days_after)
+
+
+def _canonical_url(url: str) -> str:
+    """URL with fragment and tracking parameters (utm_*, fbclid, ...) removed, for de-duplication."""
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not (k.lower().startswith("utm_") or k.lower() in TRACKING_QUERY_PARAMS)
+    ]
+    return parts._replace(
+        scheme=parts.scheme.lower(),
+        netloc=parts.netloc.lower(),
+        query=urlencode(query),
+        fragment=""
+    ).geturl()
+
+
+def _parse_news_date(date_str: str) -> Optional[date]:
+    """Parse an ISO-8601 or RFC-822 (RSS pubDate) date string; None if unrecognized."""
+    text = date_str.strip()
+    try:
+        if text[:4].isdigit() and text[4:5] == "-":
+            # "2024-01-05", "2024-01-05 10:00:00", "2024-01-05T10:00:00Z"
+            return date.fromisoformat(text[:10])
+        # "Fri, 05 Jan 2024 10:00:00 GMT"
+        parsed = parsedate(text)
+        if parsed is not None:
+            return date(*parsed[:3])
+        # Date-only "Fri, 05 Jan 2024" / "05 Jan 2024"
+        return datetime.strptime(text.split(", ", 1)[-1], "%d %b %Y").date()
+    except (TypeError, ValueError, IndexError):
+        return None
 
 
 def date_in_range(date_str: str, target_date: str, days_before: int = 2, days_after: int = 2) -> bool:
     """Check if a date string falls within a range around target date."""
-    from datetime import datetime, timedelta
-    
     try:
-        # Parse target date
-        target = datetime.strptime(target_date, "%Y-%m-%d")
-        date_lower = target - timedelta(days=days_before)
-        date_upper = target + timedelta(days=days_after)
-        
-        # Try to parse the date string (could be various formats)
-        date_to_check = None
-        for fmt in ["%Y-%m-%d", "%a, %d %b %Y", "%d %b %Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]:
-            try:
-                date_to_check = datetime.strptime(date_str[:19], fmt)
-                break
-            except (ValueError, IndexError):
-                continue
+        date_lower, date_upper = _date_window(target_date, days_before, days_after)
+        date_to_check = _parse_news_date(date_str)
         
         if date_to_check is None:
             # If we can't parse, check if the date string contains the target date
             return target_date in date_str
         
-        return date_lower.date() <= date_to_check.date() <= date_upper.date()
+        return date_lower <= date_to_check <= date_upper
     except Exception:
         # If parsing fails, check if target date is in the string
         return target_date in date_str
 
 
+def _filter_source_items(
+    items: list[dict[str, Any]],
+    source: dict[str, Any],
+    default_type: str,
+    date_filter: Optional[str],
+    date_range_days: int,
+    match_symbol: Optional[str] = None,
+    applies_to_all_stocks: bool = False
+) -> list[dict[str, Any]]:
+    """Tag one predefined source's items and apply date/symbol filters."""
+    results = []
+    for item in items:
+        item["source_name"] = source.get("name", "Unknown")
+        if applies_to_all_stocks:
+            item["source_type"] = default_type
+            item["applies_to_all_stocks"] = True  # Flag to indicate this applies to all stocks
+        else:
+            item["source_type"] = source.get("type", default_type)
+        # Filter by date range if provided
+        if date_filter:
+            pub_date = item.get("published_at", "")
+            if not date_in_range(pub_date, date_filter, date_range_days, date_range_days):
+                continue
+        # Filter by symbol match if required
+        if match_symbol and not matches_symbol(item, match_symbol):
+            continue
+        results.append(item)
+    return results
+
+
 def fetch_news_from_sources(
     symbol: Optional[str] = None,
     sector: Optional[str] = None,
     date_filter: Optional[str] = None,
     date_range_days: int = 2,
     limit_per_source: int = 5,
-    require_symbol_match: bool = True
+    require_symbol_match: bool = True,
+    max_workers: int = 8,
+    timeout: float = 5
 ) -> list[dict[str, Any]]:
     """
     Fetch news from predefined sources.
     
+    Feeds are fetched concurrently (see fetch_rss_feeds; at most
+    RSS_MAX_PER_HOST at a time per host); results keep the order
+    stock-specific, sector, general financial, macro-economic.
+    
     Args:
         symbol: Stock symbol (e.g., "AAPL") - REQUIRED if require_symbol_match=True
         sector: Sector name (e.g., "Technology")
@@ -288,6 +660,8 @@ def fetch_news_from_sources(
         date_range_days: Number of days before/after date_filter to include (default: 2)
         limit_per_source: Maximum items per source
         require_symbol_match: Only return news that mentions the symbol
+        max_workers: Maximum number of feeds fetched in parallel without httpx
+        timeout: Per-feed HTTP timeout in seconds
     
     Returns:
         List of news items from all relevant sources (filtered by symbol if required)
@@ -297,99 +671,66 @@ def fetch_news_from_sources(
         return []
     
     sources_config = load_news_sources()
-    all_items = []
+    match_symbol = symbol if require_symbol_match else None
     
-    # Fetch from stock-specific sources first (most relevant)
-    if symbol and symbol in sources_config.get("stock_specific_sources", {}):
-        for source in sources_config["stock_specific_sources"][symbol]:
-            try:
-                items = fetch_rss_feed(source["rss_url"], limit=limit_per_source * 2)
-                for item in items:
-                    item["source_name"] = source.get("name", "Unknown")
-                    item["source_type"] = source.get("type", "company_specific")
-                    # Filter by date range if provided
-                    if date_filter:
-                        pub_date = item.get("published_at", "")
-                        if not date_in_range(pub_date, date_filter, date_range_days, date_range_days):
-                            continue
-                    # Filter by symbol match
-                    if require_symbol_match and not matches_symbol(item, symbol):
-                        continue
-                    all_items.append(item)
-                time.sleep(0.3)
-            except Exception as e:
-                logger.warning(f"Error fetching from {source.get('name', 'Unknown')}: {e}")
+    def fetch(groups):
+        """Fetch (sources, default_type, limit, applies_to_all_stocks) groups; one filtered list per group."""
+        feeds = [(source.get("rss_url"), limit) for sources, _, limit, _ in groups for source in sources]
+        fetched = iter(fetch_rss_feeds(feeds, timeout=timeout, max_workers=max_workers))
+        results = []
+        for sources, default_type, _, applies_to_all_stocks in groups:
+            items = []
+            for source in sources:
+                items += _filter_source_items(
+                    next(fetched), source, default_type, date_filter, date_range_days,
+                    None if applies_to_all_stocks else match_symbol,
+                    applies_to_all_stocks
+                )
+            results.append(items)
+        return results
     
-    # Fetch from sector-specific sources (if symbol matches)
+    stock_sources = []
+    if symbol and symbol in sources_config.get("stock_specific_sources", {}):
+        stock_sources = sources_config["stock_specific_sources"][symbol]
+    sector_sources = []
     if sector and sector in sources_config.get("sector_sources", {}):
-        for source in sources_config["sector_sources"][sector]:
-            try:
-                items = fetch_rss_feed(source["rss_url"], limit=limit_per_source * 2)
-                for item in items:
-                    item["source_name"] = source.get("name", "Unknown")
-                    item["source_type"] = source.get("type", "sector_specific")
-                    # Filter by date range if provided
-                    if date_filter:
-                        pub_date = item.get("published_at", "")
-                        if not date_in_range(pub_date, date_filter, date_range_days, date_range_days):
-                            continue
-                    # Filter by symbol match
-                    if require_symbol_match and symbol and not matches_symbol(item, symbol):
-                        continue
-                    all_items.append(item)
-                time.sleep(0.3)
-            except Exception as e:
-                logger.warning(f"Error fetching from {source.get('name', 'Unknown')}: {e}")
+        sector_sources = sources_config["sector_sources"][sector]
+    general_sources = sources_config.get("financial_news_sites", [])
+    macro_sources = sources_config.get("macro_economic_sources", [])
+    
+    # Stock-specific sources first (most relevant), then sector-specific
+    groups = [
+        (stock_sources, "company_specific", limit_per_source * 2, False),
+        (sector_sources, "sector_specific", limit_per_source * 2, False),
+        # ALWAYS fetch from macro-economic sources (diseases, wars, economic events)
+        # These affect all stocks even if they don't mention the company
+        # Mark them with special type so they're included for all stocks
+        (macro_sources, "macro_global", limit_per_source, True),
+    ]
+    general_group = (general_sources, "general_financial", limit_per_source * 2, False)
     
     # Only fetch from general financial news sites if we need more results
     # AND we're not requiring strict symbol matching (or if symbol is provided, filter strictly)
-    if not require_symbol_match or len(all_items) < limit_per_source:
-        for source in sources_config.get("financial_news_sites", []):
-            try:
-                items = fetch_rss_feed(source["rss_url"], limit=limit_per_source * 2)
-                for item in items:
-                    item["source_name"] = source.get("name", "Unknown")
-                    item["source_type"] = source.get("type", "general_financial")
-                    # Filter by date range if provided
-                    if date_filter:
-                        pub_date = item.get("published_at", "")
-                        if not date_in_range(pub_date, date_filter, date_range_days, date_range_days):
-                            continue
-                    # Filter by symbol match if required
-                    if require_symbol_match and symbol and not matches_symbol(item, symbol):
-                        continue
-                    all_items.append(item)
-                time.sleep(0.3)  # Rate limiting
-            except Exception as e:
-                logger.warning(f"Error fetching from {source.get('name', 'Unknown')}: {e}")
+    if not require_symbol_match:
+        stock_items, sector_items, macro_items, general_items = fetch(groups + [general_group])
+    else:
+        stock_items, sector_items, macro_items = fetch(groups)
+        general_items = []
+        if len(stock_items) + len(sector_items) < limit_per_source:
+            general_items, = fetch([general_group])
     
-    # ALWAYS fetch from macro-economic sources (diseases, wars, economic events)
-    # These affect all stocks even if they don't mention the company
-    # Mark them with special type so they're included for all stocks
-    for source in sources_config.get("macro_economic_sources", []):
-        try:
-            items = fetch_rss_feed(source["rss_url"], limit=limit_per_source)
-            for item in items:
-                item["source_name"] = source.get("name", "Unknown")
-                item["source_type"] = "macro_global"  # Special type for global events
-                item["applies_to_all_stocks"] = True  # Flag to indicate this applies to all stocks
-                # Filter by date range if provided
-                if date_filter:
-                    pub_date = item.get("published_at", "")
-                    if not date_in_range(pub_date, date_filter, date_range_days, date_range_days):
-                        continue
-                all_items.append(item)
-            time.sleep(0.3)
-        except Exception as e:
-            logger.warning(f"Error fetching from {source['name']}: {e}")
+    all_items = stock_items + sector_items + general_items + macro_items
     
-    # Deduplicate by URL
+    # Deduplicate by URL, ignoring tracking parameters and fragments
     seen_urls = set()
     unique_items = []
     for item in all_items:
         url = item.get("url", "")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
+        if not url:
+            continue
+        key = _canonical_url(url)
+        if key not in seen_urls:
+            seen_urls.add(key)
             unique_items.append(item)
     
     return unique_items
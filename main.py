@@ -2,10 +2,11 @@
 import sys
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from core.config import Config
 from core.database import connect, get_signals_with_news
-from core.email import send_alert_email
+from core.email import send_alert_emails_bulk
 from agents.monitor_agent import monitor_symbol
 from agents.news_agent import fetch_news_for_signals
 from agents.summarizer_agent import generate_alert_summary
@@ -14,6 +15,9 @@ from utils.logging_config import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# Symbols monitored concurrently (each one is mostly waiting on Twelve Data)
+MONITOR_MAX_WORKERS = 8
+
 
 def main():
     """Main monitoring cycle."""
@@ -36,19 +40,32 @@ def main():
         logger.info("="*60)
         
         # Step 1: Monitor all symbols and detect signals
-        all_signals = []
-        for symbol in cfg.watchlist:
-            try:
-                signals = monitor_symbol(
+        signals_by_symbol = {}
+        max_workers = max(1, min(MONITOR_MAX_WORKERS, len(cfg.watchlist)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    monitor_symbol,
                     cfg.twelve_data_api_key,
                     symbol,
                     cfg.sqlite_path,
                     cfg
-                )
-                all_signals.extend(signals)
-                logger.info(f"{symbol}: Detected {len(signals)} alertable signals")
-            except Exception as e:
-                logger.error(f"Error monitoring {symbol}: {e}", exc_info=True)
+                ): symbol
+                for symbol in cfg.watchlist
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    signals = future.result()
+                    signals_by_symbol[symbol] = signals
+                    logger.info(f"{symbol}: Detected {len(signals)} alertable signals")
+                except Exception as e:
+                    logger.error(f"Error monitoring {symbol}: {e}", exc_info=True)
+        
+        # Keep watchlist order regardless of completion order
+        all_signals = []
+        for symbol in cfg.watchlist:
+            all_signals.extend(signals_by_symbol.get(symbol, []))
         
         if not all_signals:
             logger.info("No alertable signals detected")
@@ -66,9 +83,9 @@ def main():
             signal_data = {
                 "id": sig["signal_id"],
                 "symbol": sig["symbol"],
-                "signal_type": sig["signal"]["signal_type"],
-                "metrics": sig["signal"]["metrics"],
-                "severity": sig["signal"]["severity"],
+                "signal_type": sig["signal"].signal_type,
+                "metrics": sig["signal"].metrics,
+                "severity": sig["signal"].severity,
                 "news": news_by_symbol.get(sig["symbol"], {}).get("direct", [])[:3]
             }
             signals_with_news.append(signal_data)
@@ -81,17 +98,18 @@ def main():
             logger.warning("Empty alert message generated")
             return
         
-        # Step 5: Send email alert
+        # Step 5: Send email alert to each recipient over one SMTP session
         logger.info("Sending alert email...")
-        success = send_alert_email(
+        recipients = [r.strip() for r in cfg.alert_email_to.split(",") if r.strip()]
+        subject = "Stock Alert: Price Movements Detected"
+        sent = send_alert_emails_bulk(
             cfg.smtp_host,
             cfg.smtp_port,
             cfg.smtp_user,
             cfg.smtp_password,
-            cfg.alert_email_to,
-            "Stock Alert: Price Movements Detected",
-            alert_message
+            [(to_email, subject, alert_message) for to_email in recipients]
         )
+        success = bool(recipients) and sent == len(recipients)
         
         if success:
             logger.info("Alert email sent successfully")
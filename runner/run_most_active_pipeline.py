@@ -7,56 +7,44 @@ Runs the complete most active pipeline:
 2. Analyze trends using Twelve Data
 3. Generate trade signals
 
-Run this script every 30 minutes during market hours.
+Run this script every 30 minutes during market hours, or start it once with
+--daemon to rerun the pipeline every --interval seconds in a long-lived worker
+process that keeps the agent modules imported between runs.
 """
 
 import sys
-import subprocess
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.logging_config import setup_logging
 from utils.market_hours import is_market_open
 from core.config import Config
+from agents.most_active import most_active_scrape_agent, most_active_trend_agent, most_active_trade_agent
+from runner.stages import StagePool, run_daemon, run_stage
 
 logger = logging.getLogger(__name__)
 
+DAEMON_INTERVAL_SECONDS = 1800  # Rerun the pipeline every 30 minutes in --daemon mode
 
-def run_agent(agent_module: str, agent_name: str) -> bool:
-    """Run an agent module and return True if successful."""
-    try:
-        logger.info(f"Starting {agent_name}...")
-        result = subprocess.run(
-            [sys.executable, "-m", agent_module],
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout per agent
-        )
-        
-        if result.returncode == 0:
-            logger.info(f"✅ {agent_name} completed successfully")
-            if result.stdout:
-                logger.debug(f"{agent_name} output:\n{result.stdout}")
-            return True
-        else:
-            logger.error(f"❌ {agent_name} failed with exit code {result.returncode}")
-            if result.stderr:
-                logger.error(f"{agent_name} error:\n{result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error(f"❌ {agent_name} timed out after 10 minutes")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Error running {agent_name}: {e}", exc_info=True)
-        return False
+AGENT_MODULES = (
+    "agents.most_active.most_active_scrape_agent",
+    "agents.most_active.most_active_trend_agent",
+    "agents.most_active.most_active_trade_agent",
+)
 
 
-def main():
-    """Run the complete most active pipeline."""
+def main(pool: Optional[StagePool] = None):
+    """
+    Run the complete most active pipeline.
+    
+    Args:
+        pool: Worker pool to run the agents in; None runs them in this process
+    """
     setup_logging("INFO", "most_active_pipeline.log")
     
     logger.info("="*60)
@@ -75,7 +63,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 1: Scraping Most Active Stocks")
         logger.info("="*60)
-        success1 = run_agent("agents.most_active.most_active_scrape_agent", "Most Active Scrape Agent")
+        success1 = run_stage(pool, most_active_scrape_agent.main, "Most Active Scrape Agent")
         
         if not success1:
             logger.warning("Scrape agent failed, but continuing with pipeline...")
@@ -84,7 +72,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 2: Analyzing Trends")
         logger.info("="*60)
-        success2 = run_agent("agents.most_active.most_active_trend_agent", "Most Active Trend Agent")
+        success2 = run_stage(pool, most_active_trend_agent.main, "Most Active Trend Agent")
         
         if not success2:
             logger.warning("Trend agent failed, but continuing with pipeline...")
@@ -93,7 +81,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 3: Generating Trade Signals")
         logger.info("="*60)
-        success3 = run_agent("agents.most_active.most_active_trade_agent", "Most Active Trade Agent")
+        success3 = run_stage(pool, most_active_trade_agent.main, "Most Active Trade Agent")
         
         # Summary
         logger.info("\n" + "="*60)
@@ -116,4 +104,13 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--daemon", action="store_true", help="Keep running and rerun the pipeline every --interval seconds")
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL_SECONDS, help="Seconds between runs in --daemon mode")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        setup_logging("INFO", "most_active_pipeline.log")
+        run_daemon(main, AGENT_MODULES, args.interval)
+    else:
+        sys.exit(main())
@@ -7,56 +7,44 @@ Runs the complete top gainers pipeline:
 2. Analyze trends using Twelve Data
 3. Generate trade signals
 
-Run this script every 30 minutes during market hours.
+Run this script every 30 minutes during market hours, or start it once with
+--daemon to rerun the pipeline every --interval seconds in a long-lived worker
+process that keeps the agent modules imported between runs.
 """
 
 import sys
-import subprocess
 import logging
+import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.logging_config import setup_logging
 from utils.market_hours import is_market_open
 from core.config import Config
+from agents.top_gainers import top_gainers_scrape_agent, top_gainers_trend_agent, top_gainers_trade_agent
+from runner.stages import StagePool, run_daemon, run_stage
 
 logger = logging.getLogger(__name__)
 
+DAEMON_INTERVAL_SECONDS = 1800  # Rerun the pipeline every 30 minutes in --daemon mode
 
-def run_agent(agent_module: str, agent_name: str) -> bool:
-    """Run an agent module and return True if successful."""
-    try:
-        logger.info(f"Starting {agent_name}...")
-        result = subprocess.run(
-            [sys.executable, "-m", agent_module],
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout per agent
-        )
-        
-        if result.returncode == 0:
-            logger.info(f"✅ {agent_name} completed successfully")
-            if result.stdout:
-                logger.debug(f"{agent_name} output:\n{result.stdout}")
-            return True
-        else:
-            logger.error(f"❌ {agent_name} failed with exit code {result.returncode}")
-            if result.stderr:
-                logger.error(f"{agent_name} error:\n{result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error(f"❌ {agent_name} timed out after 10 minutes")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Error running {agent_name}: {e}", exc_info=True)
-        return False
+AGENT_MODULES = (
+    "agents.top_gainers.top_gainers_scrape_agent",
+    "agents.top_gainers.top_gainers_trend_agent",
+    "agents.top_gainers.top_gainers_trade_agent",
+)
 
 
-def main():
-    """Run the complete top gainers pipeline."""
+def main(pool: Optional[StagePool] = None):
+    """
+    Run the complete top gainers pipeline.
+    
+    Args:
+        pool: Worker pool to run the agents in; None runs them in this process
+    """
     setup_logging("INFO", "top_gainers_pipeline.log")
     
     logger.info("="*60)
@@ -75,7 +63,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 1: Scraping Top Gainers")
         logger.info("="*60)
-        success1 = run_agent("agents.top_gainers.top_gainers_scrape_agent", "Top Gainers Scrape Agent")
+        success1 = run_stage(pool, top_gainers_scrape_agent.main, "Top Gainers Scrape Agent")
         
         if not success1:
             logger.warning("Scrape agent failed, but continuing with pipeline...")
@@ -84,7 +72,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 2: Analyzing Trends")
         logger.info("="*60)
-        success2 = run_agent("agents.top_gainers.top_gainers_trend_agent", "Top Gainers Trend Agent")
+        success2 = run_stage(pool, top_gainers_trend_agent.main, "Top Gainers Trend Agent")
         
         if not success2:
             logger.warning("Trend agent failed, but continuing with pipeline...")
@@ -93,7 +81,7 @@ def main():
         logger.info("\n" + "="*60)
         logger.info("STEP 3: Generating Trade Signals")
         logger.info("="*60)
-        success3 = run_agent("agents.top_gainers.top_gainers_trade_agent", "Top Gainers Trade Agent")
+        success3 = run_stage(pool, top_gainers_trade_agent.main, "Top Gainers Trade Agent")
         
         # Summary
         logger.info("\n" + "="*60)
@@ -116,4 +104,13 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--daemon", action="store_true", help="Keep running and rerun the pipeline every --interval seconds")
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL_SECONDS, help="Seconds between runs in --daemon mode")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        setup_logging("INFO", "top_gainers_pipeline.log")
+        run_daemon(main, AGENT_MODULES, args.interval)
+    else:
+        sys.exit(main())
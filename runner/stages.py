@@ -0,0 +1,184 @@
+"""
+Stage running shared by the pipeline runners.
+
+Agents run in-process (or in one long-lived worker process in --daemon mode)
+with a timeout per stage; see run_stage and run_daemon.
+"""
+
+import os
+import time
+import signal
+import logging
+import importlib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+AGENT_TIMEOUT_SECONDS = 600  # 10 minute timeout per agent
+# Extra wait for a worker stage past AGENT_TIMEOUT_SECONDS before the worker is killed
+WORKER_GRACE_SECONDS = 60
+
+
+class AgentTimeout(BaseException):
+    """
+    Raised when an agent stage runs past AGENT_TIMEOUT_SECONDS.
+    
+    Derives from BaseException (like KeyboardInterrupt) so the agents'
+    own `except Exception` handlers cannot swallow it.
+    """
+
+
+def _on_agent_timeout(signum, frame):
+    raise AgentTimeout()
+
+
+@contextmanager
+def _agent_logging():
+    """
+    Detach the pipeline's root log handlers while an agent runs.
+    
+    Agents call setup_logging themselves; this keeps their output in their own
+    log files (as when they ran as subprocesses) and drops their handlers afterwards.
+    """
+    root = logging.getLogger()
+    saved_handlers = root.handlers[:]
+    saved_level = root.level
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    try:
+        yield
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+
+def run_agent(agent_main: Callable[[], None], agent_name: str) -> bool:
+    """Run an agent's main() in-process and return True if successful."""
+    logger.info(f"Starting {agent_name}...")
+    use_alarm = hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _on_agent_timeout)
+        signal.alarm(AGENT_TIMEOUT_SECONDS)
+    try:
+        with _agent_logging():
+            agent_main()
+        logger.info(f"✅ {agent_name} completed successfully")
+        return True
+    except AgentTimeout:
+        logger.error(f"❌ {agent_name} timed out after {AGENT_TIMEOUT_SECONDS}s")
+        return False
+    except SystemExit as e:
+        # Agents report fatal errors with sys.exit(1)
+        if e.code in (0, None):
+            logger.info(f"✅ {agent_name} completed successfully")
+            return True
+        logger.error(f"❌ {agent_name} failed with exit code {e.code}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Error running {agent_name}: {e}", exc_info=True)
+        return False
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _preload_agents(agent_modules: Sequence[str]):
+    """Worker initializer: import the agent modules once per worker process."""
+    for module in agent_modules:
+        importlib.import_module(module)
+
+
+def _run_agent_in_worker(agent_main: Callable[[], None], agent_name: str) -> bool:
+    """run_agent for a pool worker; workers exit without logging.shutdown, so flush logs before returning."""
+    try:
+        return run_agent(agent_main, agent_name)
+    finally:
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
+
+class StagePool:
+    """
+    One worker process that runs pipeline stages, keeping the agent modules
+    imported between runs. The worker is replaced if it dies or hangs.
+    """
+    
+    def __init__(self, agent_modules: Sequence[str] = ()):
+        self.agent_modules = tuple(agent_modules)
+        self._start()
+    
+    def _start(self):
+        self._executor = ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_preload_agents,
+            initargs=(self.agent_modules,)
+        )
+        self._worker_pid = self._executor.submit(os.getpid).result()
+    
+    def restart(self):
+        """Kill the worker (it may be stuck where SIGALRM cannot reach) and start a new one."""
+        try:
+            os.kill(self._worker_pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._start()
+    
+    def run(self, agent_main: Callable[[], None], agent_name: str) -> bool:
+        """Run an agent in the worker and return True if successful."""
+        future = self._executor.submit(_run_agent_in_worker, agent_main, agent_name)
+        try:
+            return future.result(timeout=AGENT_TIMEOUT_SECONDS + WORKER_GRACE_SECONDS)
+        except FuturesTimeoutError:
+            logger.error(f"❌ {agent_name} worker did not return within "
+                         f"{AGENT_TIMEOUT_SECONDS + WORKER_GRACE_SECONDS}s, restarting it")
+            self.restart()
+            return False
+        except BrokenProcessPool as e:
+            logger.error(f"❌ {agent_name} worker process died: {e}")
+            self.restart()
+            return False
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_stage(pool: Optional[StagePool], agent_main: Callable[[], None], agent_name: str) -> bool:
+    """Run an agent in the worker pool if one is given, otherwise in-process."""
+    if pool is None:
+        return run_agent(agent_main, agent_name)
+    return pool.run(agent_main, agent_name)
+
+
+def run_daemon(
+    pipeline_main: Callable[[Optional[StagePool]], int],
+    agent_modules: Sequence[str],
+    interval: float
+):
+    """
+    Run a pipeline every `interval` seconds, reusing one worker process while it stays healthy.
+    
+    Args:
+        pipeline_main: The runner's main(pool)
+        agent_modules: Agent modules the worker imports once at startup
+        interval: Seconds from the start of one run to the start of the next
+    """
+    logger.info(f"Pipeline daemon started (every {interval:.0f}s)")
+    pool = StagePool(agent_modules)
+    try:
+        while True:
+            started = time.monotonic()
+            pipeline_main(pool)
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        logger.info("Pipeline daemon stopped")
+    finally:
+        pool.shutdown()
@@ -0,0 +1,112 @@
+"""Tests for the SQLite helpers in core.database."""
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import database
+from core.signals import Signal
+
+# news_items as created before url became the dedup key
+LEGACY_NEWS_ITEMS = """
+CREATE TABLE news_items (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  published_at TEXT,
+  title TEXT NOT NULL,
+  source TEXT,
+  url TEXT NOT NULL,
+  query TEXT,
+  hash TEXT NOT NULL,
+  UNIQUE(hash)
+);
+CREATE INDEX idx_news_items_hash ON news_items(hash);
+"""
+
+
+class DatabaseTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.db_path = str(Path(tmp.name) / "test.db")
+        self.addCleanup(self.close_cached_connection)
+    
+    def close_cached_connection(self):
+        conn = getattr(database._local, "conns", {}).pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
+
+
+class StoreNewsItemTest(DatabaseTestCase):
+    def test_duplicate_url_returns_existing_id(self):
+        first = database.store_news_item(self.db_path, "Title", "https://example.com/a", None, "src", "q")
+        again = database.store_news_item(self.db_path, "Other title", "https://example.com/a", None, "src", "q")
+        other = database.store_news_item(self.db_path, "Title", "https://example.com/b", None, "src", "q")
+        self.assertGreater(first, 0)
+        self.assertEqual(again, first)
+        self.assertNotEqual(other, first)
+    
+    def test_legacy_hash_column_is_dropped(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(LEGACY_NEWS_ITEMS)
+        conn.execute(
+            "INSERT INTO news_items (id, title, url, hash) VALUES (7, 'Old', 'https://example.com/old', 'abc')"
+        )
+        conn.commit()
+        conn.close()
+        
+        new_id = database.store_news_item(self.db_path, "New", "https://example.com/new", None, "src", "q")
+        old_id = database.store_news_item(self.db_path, "Old", "https://example.com/old", None, "src", "q")
+        self.assertGreater(new_id, 7)
+        self.assertEqual(old_id, 7)
+        with database.db(self.db_path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(news_items)")]
+        self.assertNotIn("hash", columns)
+
+
+
+class DbContextTest(DatabaseTestCase):
+    def test_connection_is_reused_per_thread(self):
+        with database.db(self.db_path) as first, database.db(self.db_path) as second:
+            self.assertIs(first, second)
+    
+    def test_open_transaction_rolled_back_on_exit(self):
+        with self.assertRaises(RuntimeError):
+            with database.db(self.db_path) as conn:
+                conn.execute("INSERT INTO alert_log (symbol, last_alert_at) VALUES ('AAA', 't')")
+                raise RuntimeError("write failed")
+        self.assertFalse(conn.in_transaction)
+        # No lock is left held: another connection can write straight away
+        other = sqlite3.connect(self.db_path, timeout=0)
+        self.addCleanup(other.close)
+        other.execute("INSERT INTO alert_log (symbol, last_alert_at) VALUES ('BBB', 't')")
+        other.commit()
+        with database.db(self.db_path) as conn:
+            symbols = [row["symbol"] for row in conn.execute("SELECT symbol FROM alert_log")]
+        self.assertEqual(symbols, ["BBB"])
+
+
+class StoreSignalsBatchTest(DatabaseTestCase):
+    def test_duplicates_are_ignored(self):
+        signals = [
+            Signal("move_from_open", {"pct_change": 2.0}, "medium", "bar-1"),
+            Signal("volume_spike", {"multiplier": 3.0}, "high", "bar-1"),
+        ]
+        first = database.store_signals_batch(self.db_path, "AAA", "2026-01-02 10:00:00", signals)
+        self.assertTrue(all(first))
+        again = database.store_signals_batch(
+            self.db_path, "AAA", "2026-01-02 10:00:00",
+            [signals[0], Signal("breakout", {"level": 10.0}, "high", "bar-1")]
+        )
+        self.assertIsNone(again[0])
+        self.assertIsNotNone(again[1])
+        self.assertNotIn(again[1], first)
+        with database.db(self.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM signals WHERE symbol = 'AAA'").fetchone()[0]
+        self.assertEqual(count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
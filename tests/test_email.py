@@ -0,0 +1,44 @@
+"""Tests for alert email delivery."""
+import smtplib
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import email
+
+
+class SendAlertEmailsBulkTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(email.smtplib, "SMTP")
+        self.smtp = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = self.smtp.return_value.__enter__.return_value
+    
+    def test_one_login_for_all_messages(self):
+        messages = [(f"user{i}@example.com", "Subject", "Body") for i in range(3)]
+        sent = email.send_alert_emails_bulk("smtp.example.com", 587, "me@example.com", "pw", messages)
+        self.assertEqual(sent, 3)
+        self.smtp.assert_called_once_with("smtp.example.com", 587)
+        self.server.login.assert_called_once_with("me@example.com", "pw")
+        self.assertEqual(self.server.sendmail.call_count, 3)
+        recipients = [call.args[1] for call in self.server.sendmail.call_args_list]
+        self.assertEqual(recipients, [[to] for to, _, _ in messages])
+    
+    def test_refused_recipient_is_skipped(self):
+        self.server.sendmail.side_effect = [None, smtplib.SMTPRecipientsRefused({}), None]
+        messages = [(f"user{i}@example.com", "Subject", "Body") for i in range(3)]
+        with self.assertLogs(email.logger, "ERROR"):
+            sent = email.send_alert_emails_bulk("smtp.example.com", 587, "me@example.com", "pw", messages)
+        self.assertEqual(sent, 2)
+        self.assertEqual(self.server.sendmail.call_count, 3)
+    
+    def test_no_messages_opens_no_connection(self):
+        self.assertEqual(email.send_alert_emails_bulk("smtp.example.com", 587, "me", "pw", []), 0)
+        self.smtp.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the buffered, queued logging set up by setup_logging."""
+import io
+import logging
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import logging_config
+
+
+class SetupLoggingTest(unittest.TestCase):
+    def setUp(self):
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        for handler in saved_handlers:
+            root.removeHandler(handler)
+        
+        def restore():
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+                handler.close()
+            for handler in saved_handlers:
+                root.addHandler(handler)
+            root.setLevel(saved_level)
+        self.addCleanup(restore)
+        
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log_file = Path(tmp.name) / "test.log"
+        # Keep the console handler's output out of the test run
+        stdout = mock.patch.object(sys, "stdout", io.StringIO())
+        stdout.start()
+        self.addCleanup(stdout.stop)
+    
+    def test_idle_buffer_reaches_file(self):
+        with mock.patch.object(logging_config, "LOG_FLUSH_INTERVAL_SECONDS", 0.2):
+            logging_config.setup_logging("INFO", str(self.log_file))
+            logging.getLogger("test").info("last line before going quiet")
+            time.sleep(1)
+            self.assertIn("last line before going quiet", self.log_file.read_text())
+    
+    def test_flush_writes_queued_records(self):
+        logging_config.setup_logging("INFO", str(self.log_file))
+        queue_handler = logging.getLogger().handlers[0]
+        listener_thread = queue_handler.listener._thread
+        logging.getLogger("test").info("queued before flush")
+        queue_handler.flush()
+        self.assertIn("queued before flush", self.log_file.read_text())
+        # The listener keeps running rather than being restarted
+        self.assertIs(queue_handler.listener._thread, listener_thread)
+        self.assertTrue(listener_thread.is_alive())
+    
+    def test_debug_enabled_follows_level(self):
+        logging_config.setup_logging("DEBUG", str(self.log_file))
+        self.assertTrue(logging_config.debug_enabled())
+        logging_config.setup_logging("INFO", str(self.log_file))
+        self.assertFalse(logging_config.debug_enabled())
+
+    
+    def test_level_change_reaches_cached_loggers(self):
+        logger = logging.getLogger("test.cached")
+        logging_config.setup_logging("INFO", str(self.log_file))
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        logging_config.setup_logging("DEBUG", str(self.log_file))
+        self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+        # Unknown names fall back to INFO
+        logging_config.setup_logging("VERBOSE", str(self.log_file))
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        self.assertTrue(logger.isEnabledFor(logging.INFO))
+
+
+if __name__ == "__main__":
+    unittest.main()
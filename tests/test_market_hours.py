@@ -0,0 +1,87 @@
+"""Tests for the London market-hours helpers and their caches."""
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import market_hours
+
+
+def _utc(text: str) -> float:
+    return datetime.fromisoformat(text).replace(tzinfo=timezone.utc).timestamp()
+
+
+class MarketHoursTestCase(unittest.TestCase):
+    def setUp(self):
+        # Start every test with empty caches and a controllable clock
+        patcher = mock.patch.multiple(
+            market_hours,
+            _today_cache=(0.0, ""),
+            _offset_cache=(0.0, 0.0, 0),
+            _is_open_cache=(float("-inf"), 0, 0, False),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 0.0
+        self.mono = 1000.0
+        for name, clock in (("time", lambda: self.now), ("monotonic", lambda: self.mono)):
+            clock_patcher = mock.patch.object(market_hours.time, name, clock)
+            clock_patcher.start()
+            self.addCleanup(clock_patcher.stop)
+    
+    def is_open_at(self, utc_text: str, open_hour: int = 8, close_hour: int = 16) -> bool:
+        self.now = _utc(utc_text)
+        self.mono += market_hours.IS_OPEN_TTL_SECONDS  # past the TTL
+        return market_hours.is_market_open(open_hour, close_hour)
+
+
+class LondonOffsetTest(MarketHoursTestCase):
+    def test_spring_forward_at_0100_utc(self):
+        self.assertEqual(market_hours._london_offset(_utc("2026-03-28 12:00:00")), 0)
+        self.assertEqual(market_hours._london_offset(_utc("2026-03-29 00:59:59")), 0)
+        self.assertEqual(market_hours._london_offset(_utc("2026-03-29 01:00:00")), 3600)
+        self.assertEqual(market_hours._london_offset(_utc("2026-03-29 00:30:00")), 0)
+    
+    def test_fall_back_at_0100_utc(self):
+        self.assertEqual(market_hours._london_offset(_utc("2026-10-25 00:59:59")), 3600)
+        self.assertEqual(market_hours._london_offset(_utc("2026-10-25 01:00:00")), 0)
+
+
+class IsMarketOpenTest(MarketHoursTestCase):
+    def test_hours_follow_london_time(self):
+        # Friday before the change: 07:30 UTC is 07:30 GMT
+        self.assertFalse(self.is_open_at("2026-03-27 07:30:00"))
+        self.assertTrue(self.is_open_at("2026-03-27 08:00:00"))
+        self.assertFalse(self.is_open_at("2026-03-27 16:00:00"))
+        # Monday after the change: 07:30 UTC is 08:30 BST
+        self.assertTrue(self.is_open_at("2026-03-30 07:30:00"))
+        self.assertTrue(self.is_open_at("2026-03-30 14:59:59"))
+        self.assertFalse(self.is_open_at("2026-03-30 15:00:00"))
+    
+    def test_closed_at_weekends(self):
+        self.assertFalse(self.is_open_at("2026-03-28 10:00:00"))
+        self.assertFalse(self.is_open_at("2026-03-29 10:00:00"))
+    
+    def test_answer_reused_within_ttl(self):
+        self.assertTrue(self.is_open_at("2026-03-27 15:59:59"))
+        self.now = _utc("2026-03-27 16:00:00")
+        self.assertTrue(market_hours.is_market_open(8, 16))
+        # Other hours are not served from the cache
+        self.assertFalse(market_hours.is_market_open(8, 15))
+        self.mono += market_hours.IS_OPEN_TTL_SECONDS
+        self.assertFalse(market_hours.is_market_open(8, 16))
+
+
+class GetTodayDateTest(MarketHoursTestCase):
+    def test_date_changes_at_london_midnight(self):
+        self.now = _utc("2026-06-01 22:59:59")
+        self.assertEqual(market_hours.get_today_date(), "2026-06-01")
+        self.now = _utc("2026-06-01 23:00:00")
+        self.assertEqual(market_hours.get_today_date(), "2026-06-02")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests for the pipeline runners and their shared stage handling."""
+import importlib
+import os
+import signal
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from runner import stages
+
+RUNNER_MODULES = (
+    "run_top_gainers_pipeline",
+    "runner.run_top_gainers_pipeline",
+    "runner.run_most_active_pipeline",
+)
+
+
+def _agent_swallowing_exceptions():
+    """Agent that retries through `except Exception`, as the trend agents do."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            time.sleep(0.05)
+        except Exception:
+            pass
+
+
+def _agent_ignoring_alarm():
+    """Agent stuck where SIGALRM cannot interrupt it."""
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(30)
+
+
+def _agent_killing_worker():
+    os._exit(3)
+
+
+def _agent_ok():
+    pass
+
+
+@unittest.skipUnless(hasattr(signal, "SIGALRM"), "agent timeout needs SIGALRM")
+class RunAgentTimeoutTest(unittest.TestCase):
+    def test_timeout_not_swallowed_by_agent(self):
+        with mock.patch.object(stages, "AGENT_TIMEOUT_SECONDS", 1), \
+                self.assertLogs(stages.logger, "ERROR") as logs:
+            started = time.monotonic()
+            ok = stages.run_agent(_agent_swallowing_exceptions, "Slow Agent")
+        self.assertFalse(ok)
+        self.assertLess(time.monotonic() - started, 4)
+        self.assertIn("timed out", logs.output[-1])
+
+
+@unittest.skipUnless(hasattr(signal, "SIGALRM"), "agent timeout needs SIGALRM")
+class StagePoolTest(unittest.TestCase):
+    def setUp(self):
+        # Patch before the worker is forked so it inherits the short timeout
+        patcher = mock.patch.multiple(stages, AGENT_TIMEOUT_SECONDS=1, WORKER_GRACE_SECONDS=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = stages.StagePool()
+        self.addCleanup(self.pool.shutdown)
+    
+    def test_hung_worker_is_replaced(self):
+        with self.assertLogs(stages.logger, "ERROR"):
+            started = time.monotonic()
+            self.assertFalse(self.pool.run(_agent_ignoring_alarm, "Hung Agent"))
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertTrue(self.pool.run(_agent_ok, "Next Agent"))
+    
+    def test_dead_worker_is_replaced(self):
+        with self.assertLogs(stages.logger, "ERROR"):
+            self.assertFalse(self.pool.run(_agent_killing_worker, "Crashing Agent"))
+        self.assertTrue(self.pool.run(_agent_ok, "Next Agent"))
+
+
+
+class RunnerMainTest(unittest.TestCase):
+    def test_main_configures_logging(self):
+        for name in RUNNER_MODULES:
+            with self.subTest(runner=name):
+                runner = importlib.import_module(name)
+                with mock.patch.object(runner, "setup_logging") as setup_logging, \
+                        mock.patch.object(runner.Config, "from_env", side_effect=ValueError("no config")), \
+                        self.assertLogs(runner.logger, "ERROR"):
+                    self.assertEqual(runner.main(), 1)
+                setup_logging.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Tests for the market data and news fetching helpers."""
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import tools
+
+
+COMPANY_NAMES = {
+    "AAPL": {"name": "Apple Inc.", "aliases": ["Apple"]},
+    "BARC.L": {"name": "Barclays PLC", "aliases": ["Barclays"]},
+}
+
+
+class MatchesSymbolTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(tools, "load_company_names", return_value=COMPANY_NAMES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for cached in (tools._symbol_match_terms, tools._symbol_regex, tools._symbol_automaton):
+            cached.cache_clear()
+            self.addCleanup(cached.cache_clear)
+    
+    def check(self, symbol: str, title: str, expected: bool):
+        matchers = [("regex", None)]
+        if tools.ahocorasick is not None:
+            matchers.append(("automaton", tools.ahocorasick))
+        for matcher, module in matchers:
+            with self.subTest(matcher=matcher, title=title), \
+                    mock.patch.object(tools, "ahocorasick", module):
+                self.assertIs(tools.matches_symbol({"title": title}, symbol), expected)
+    
+    def test_whole_words_only(self):
+        self.check("AAPL", "AAPL shares jump", True)
+        self.check("AAPL", "Shares of (AAPL) rose", True)
+        self.check("AAPL", "AAPLX fund rebalances", False)
+        self.check("AAPL", "Pineapple prices climb", False)
+    
+    def test_names_and_aliases_ignore_case(self):
+        self.check("AAPL", "apple unveils new phone", True)
+        self.check("AAPL", "APPLE INC. beats estimates", True)
+        self.check("BARC.L", "Barclays results due", True)
+        self.check("BARC.L", "BARC falls in London", True)
+    
+    def test_description_is_searched(self):
+        item = {"title": "Markets wrap", "description": "Barclays led banks lower"}
+        self.assertTrue(tools.matches_symbol(item, "BARC.L"))
+        self.assertFalse(tools.matches_symbol({"title": "Markets wrap"}, "BARC.L"))
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_is_paced_to_the_refill_rate(self):
+        clock = [1000.0]
+        sleeps = []
+        
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+        
+        with mock.patch.object(tools.time, "monotonic", lambda: clock[0]), \
+                mock.patch.object(tools.time, "sleep", sleep):
+            bucket = tools.TokenBucket(8, period=60.0)
+            for _ in range(10):
+                bucket.acquire()
+        # The first 8 go straight through; each later one waits 60/8 seconds
+        self.assertEqual(len(sleeps), 2)
+        self.assertAlmostEqual(sum(sleeps), 15.0)
+        self.assertAlmostEqual(clock[0] - 1000.0, 15.0)
+
+
+@unittest.skipIf(tools.httpx is None, "needs httpx")
+class FetchRssFeedsTest(unittest.TestCase):
+    def test_retries_like_the_requests_session(self):
+        statuses = [503, 429, 200]
+        seen = []
+        
+        def respond(request):
+            seen.append(request.headers["User-Agent"])
+            status = statuses.pop(0)
+            return tools.httpx.Response(status, headers={"Retry-After": "0"} if status == 429 else {})
+        
+        async def fetch():
+            async with tools.httpx.AsyncClient(transport=tools.httpx.MockTransport(respond),
+                                               headers=tools.RSS_HEADERS) as client:
+                return await tools._get_with_retries(client, "https://example.com/rss")
+        
+        with mock.patch.object(tools.asyncio, "sleep", mock.AsyncMock()) as sleep:
+            response = asyncio.run(fetch())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen, [tools.RSS_HEADERS["User-Agent"]] * 3)
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [tools.HTTP_RETRY_BACKOFF, 0])
+    
+    def test_gives_up_after_retry_total(self):
+        calls = []
+        
+        def respond(request):
+            calls.append(request)
+            return tools.httpx.Response(503)
+        
+        async def fetch():
+            async with tools.httpx.AsyncClient(transport=tools.httpx.MockTransport(respond)) as client:
+                return await tools._get_with_retries(client, "https://example.com/rss")
+        
+        with mock.patch.object(tools.asyncio, "sleep", mock.AsyncMock()):
+            response = asyncio.run(fetch())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(calls), tools.HTTP_RETRY_TOTAL + 1)
+    
+    def test_inside_running_loop_uses_threads(self):
+        feeds = [("https://a.example/rss", 2), ("https://b.example/rss", 3)]
+        
+        async def caller():
+            return tools.fetch_rss_feeds(feeds)
+        
+        with mock.patch.object(tools, "fetch_rss_feed", side_effect=lambda url, limit, timeout: [url, limit]):
+            result = asyncio.run(caller())
+        self.assertEqual(result, [["https://a.example/rss", 2], ["https://b.example/rss", 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,32 +1,296 @@
 """Logging configuration."""
 import logging
+import logging.handlers
+import os
+import queue
+import signal
 import sys
+import threading
+import time
+import weakref
 from pathlib import Path
 
 
-def setup_logging(log_level: str, log_file: str):
-    """Setup logging to both console and file."""
-    level = getattr(logging, log_level.upper(), logging.INFO)
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders asctime once per second and reuses it for the records within it."""
     
-    # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, None, "")  # (second, datefmt, formatted)
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        sec = int(record.created)
+        cached_sec, cached_datefmt, text = self._time_cache
+        if sec != cached_sec or datefmt != cached_datefmt:
+            text = time.strftime(datefmt or self.default_time_format, self.converter(sec))
+            self._time_cache = (sec, datefmt, text)
+        if datefmt:
+            return text
+        return self.default_msec_format % (text, record.msecs)
+
+
+# Log files rotate at this size, keeping LOG_BACKUP_COUNT old files
+LOG_MAX_BYTES = 64 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Buffered records are written once the oldest has waited about this long
+LOG_FLUSH_INTERVAL_SECONDS = 5.0
+
+# Longest BackgroundQueueHandler.flush waits for the listener to catch up
+LOG_FLUSH_WAIT_SECONDS = 10.0
+
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that writes a batch of records with one write and one flush."""
+    
+    def emit_batch(self, records: list[logging.LogRecord]):
+        self.acquire()
+        try:
+            text = "".join(self.format(record) + self.terminator for record in records)
+            if self.stream is None:
+                self.stream = self._open()
+            # Rotate per batch rather than per record
+            position = self.stream.tell()
+            if self.maxBytes > 0 and position > 0 and position + len(text) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(text)
+            self.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+
+class BufferedFileHandler(logging.handlers.MemoryHandler):
+    """
+    Buffer records in memory and write them to a rotating log file in batches.
+    
+    The buffer is flushed when it holds `capacity` records, on an ERROR or
+    worse, and on close (logging.shutdown runs that at exit). Records older
+    than LOG_FLUSH_INTERVAL_SECONDS are flushed when the next record arrives,
+    or by FlushingQueueListener when logging goes quiet. Closing also closes
+    the file.
+    """
+    
+    def __init__(self, log_file: str, capacity: int):
+        super().__init__(
+            capacity,
+            flushLevel=logging.ERROR,
+            target=BatchRotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT),
+            flushOnClose=True
+        )
+    
+    def setFormatter(self, fmt: logging.Formatter):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return (
+            super().shouldFlush(record)
+            or record.created - self.buffer[0].created >= LOG_FLUSH_INTERVAL_SECONDS
+        )
+    
+    def flush_if_stale(self):
+        """Flush if the oldest buffered record is LOG_FLUSH_INTERVAL_SECONDS old."""
+        self.acquire()
+        try:
+            if self.buffer and time.time() - self.buffer[0].created >= LOG_FLUSH_INTERVAL_SECONDS:
+                self.flush()
+        finally:
+            self.release()
+    
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target is not None and self.buffer:
+                self.target.emit_batch(self.buffer)
+                self.buffer.clear()
+        finally:
+            self.release()
+    
+    def close(self):
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+
+class _FlushRequest:
+    """Queue marker: the listener flushes its handlers when it reaches it, then sets `done`."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that flushes its handlers on a _FlushRequest, and flushes
+    stale BufferedFileHandler records while the queue is idle.
+    """
+    
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if not block:
+            return super().dequeue(block)
+        while True:
+            try:
+                return self.queue.get(timeout=LOG_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                for handler in self.handlers:
+                    if isinstance(handler, BufferedFileHandler):
+                        handler.flush_if_stale()
+    
+    def handle(self, record: logging.LogRecord):
+        if isinstance(record, _FlushRequest):
+            for handler in self.handlers:
+                handler.flush()
+            record.done.set()
+            return
+        super().handle(record)
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a QueueListener thread that owns the real handlers.
+    
+    Callers only enqueue; formatting and I/O happen on the listener thread.
+    Closing the handler (logging.shutdown does so at exit) drains the queue,
+    stops the listener and closes its handlers.
+    """
+    
+    def __init__(self, *handlers: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self._start_listener(handlers)
+        _queue_handlers.add(self)
+    
+    def _start_listener(self, handlers):
+        self.listener = FlushingQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        self._listener_running = True
+    
+    def restart_listener(self):
+        """Start a new listener thread on a new queue (the old thread is gone after fork)."""
+        if not self._listener_running:
+            return
+        for handler in self.listener.handlers:
+            # Records still buffered belong to the parent, which writes them
+            if isinstance(handler, logging.handlers.MemoryHandler):
+                handler.buffer.clear()
+        self.queue = queue.SimpleQueue()
+        self._start_listener(self.listener.handlers)
+    
+    def flush(self):
+        """
+        Wait until every record queued so far is written.
+        
+        A marker is queued behind them and the listener flushes its handlers
+        when it gets there; the listener thread keeps running.
+        """
+        if not self._listener_running:
+            return
+        request = _FlushRequest()
+        self.queue.put_nowait(request)
+        request.done.wait(LOG_FLUSH_WAIT_SECONDS)
+    
+    def close(self):
+        self.acquire()
+        try:
+            if self._listener_running:
+                self._listener_running = False
+                self.listener.stop()
+                for handler in self.listener.handlers:
+                    handler.close()
+        finally:
+            self.release()
+        super().close()
+
+
+_queue_handlers = weakref.WeakSet()
+
+
+def _restart_listeners_after_fork():
+    # Listener threads do not survive fork() (e.g. ProcessPoolExecutor workers)
+    for handler in list(_queue_handlers):
+        handler.restart_listener()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
+
+# One formatter shared by every handler setup_logging creates
+_formatter = CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+# Whether the root logger passes DEBUG records; refreshed by setup_logging
+_debug_enabled = False
+
+
+def debug_enabled() -> bool:
+    """
+    Cheap check for hot loops that build values only for a debug log line.
+    
+    Reflects the level given to the last setup_logging call.
+    """
+    return _debug_enabled
+
+
+def _exit_on_sigterm(signum, frame):
+    # Exit normally so logging.shutdown flushes buffered records
+    sys.exit(128 + signum)
+
+
+def setup_logging(log_level: str, log_file: str, capacity: int = 512):
+    """
+    Setup logging to both console and file.
+    
+    Console and file output run on a background listener thread. File output
+    is buffered and written every `capacity` records (or on an ERROR, or at
+    exit); capacity=1 writes every record immediately.
+    
+    Calling it again with the same settings is a no-op; otherwise the root
+    logger's previous handlers are removed first so records are not written
+    twice.
+    """
+    # Resolve the level name to its number once; unknown names fall back to INFO
+    level = logging._nameToLevel.get(log_level.upper(), logging.INFO)
+    
+    global _debug_enabled
+    _debug_enabled = level <= logging.DEBUG
+    
+    root_logger = logging.getLogger()
+    settings = (level, str(Path(log_file).resolve()), capacity)
+    if any(getattr(handler, "settings", None) == settings for handler in root_logger.handlers):
+        return
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    console_handler.level = level
+    console_handler.setFormatter(_formatter)
     
     # File handler
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(level)
-    file_handler.setFormatter(formatter)
+    file_handler = BufferedFileHandler(log_file, capacity)
+    file_handler.level = level
+    file_handler.setFormatter(_formatter)
     
-    # Root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(level)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    # Root logger: records are handed to a background thread for output.
+    # Levels are plain attribute writes; the loggers' isEnabledFor caches
+    # are cleared once below instead of by each setLevel call
+    root_logger.level = level
+    queue_handler = BackgroundQueueHandler(console_handler, file_handler)
+    queue_handler.settings = settings
+    # Loggers given a lower level of their own still propagate to the root's
+    # handlers; the handler level drops those records before they are queued
+    queue_handler.level = level
+    root_logger.addHandler(queue_handler)
+    logging.Logger.manager._clear_cache()
+    
+    # A default SIGTERM kills the process without running atexit; turn it
+    # into a normal exit so the buffered records reach the file
+    if (threading.current_thread() is threading.main_thread()
+            and signal.getsignal(signal.SIGTERM) == signal.SIG_DFL):
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
@@ -1,24 +1,78 @@
 """Market hours utilities."""
-from datetime import datetime
-import pytz
+import time
+from datetime import datetime, time as dt_time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
 
-LONDON_TZ = pytz.timezone("Europe/London")
+LONDON_TZ = ZoneInfo("Europe/London")
+
+# Trading days, indexed by weekday (0=Monday, 6=Sunday)
+_OPEN_DAY = (True,) * 5 + (False,) * 2
+
+# (epoch seconds of the next London midnight, today's date string)
+_today_cache = (0.0, "")
+
+# UK clocks change at 01:00 UTC, so London's UTC offset is constant from one
+# 01:00 UTC to the next
+DST_CHANGE_UTC_SECONDS = 3600
+_offset_cache = (0.0, 0.0, 0)  # (valid from, valid until, offset seconds)
+
+# Repeated is_market_open polls within this many seconds reuse the last answer
+IS_OPEN_TTL_SECONDS = 1.0
+_is_open_cache = (float("-inf"), 0, 0, False)  # (monotonic time, open_hour, close_hour, result)
+
+
+def _london_offset(now: float) -> int:
+    """London's UTC offset in seconds at epoch time `now` (cached until the next possible DST change)."""
+    global _offset_cache
+    valid_from, valid_until, offset = _offset_cache
+    if not valid_from <= now < valid_until:
+        offset = int(datetime.fromtimestamp(now, LONDON_TZ).utcoffset().total_seconds())
+        valid_from = (now - DST_CHANGE_UTC_SECONDS) // 86400 * 86400 + DST_CHANGE_UTC_SECONDS
+        _offset_cache = (valid_from, valid_from + 86400, offset)
+    return offset
+
+
+@lru_cache(maxsize=16)
+def _build_mask(open_hour: int, close_hour: int) -> int:
+    """168-bit mask with bit weekday*24 + hour set for trading-day hours in [open_hour, close_hour)."""
+    hours = range(max(open_hour, 0), min(close_hour, 24))
+    mask = 0
+    for weekday, open_day in enumerate(_OPEN_DAY):
+        if open_day:
+            for hour in hours:
+                mask |= 1 << (weekday * 24 + hour)
+    return mask
 
 
 def is_market_open(open_hour: int, close_hour: int) -> bool:
     """Check if market is currently open (Europe/London timezone)."""
-    now = datetime.now(LONDON_TZ)
-    current_hour = now.hour
-    current_weekday = now.weekday()  # 0=Monday, 6=Sunday
+    global _is_open_cache
+    checked_at, cached_open, cached_close, result = _is_open_cache
+    now_mono = time.monotonic()
+    if now_mono - checked_at < IS_OPEN_TTL_SECONDS and (open_hour, close_hour) == (cached_open, cached_close):
+        return result
     
-    # Market closed on weekends
-    if current_weekday >= 5:
-        return False
-    
-    # Check if within market hours
-    return open_hour <= current_hour < close_hour
+    now = time.time()
+    local_seconds = int(now) + _london_offset(now)
+    days, seconds_in_day = divmod(local_seconds, 86400)
+    hour = seconds_in_day // 3600
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday; 0=Monday, 6=Sunday
+    result = bool(_build_mask(open_hour, close_hour) >> (weekday * 24 + hour) & 1)
+    _is_open_cache = (now_mono, open_hour, close_hour, result)
+    return result
 
 
 def get_today_date() -> str:
-    """Get today's date in YYYY-MM-DD format (London timezone)."""
-    return datetime.now(LONDON_TZ).strftime("%Y-%m-%d")
+    """Get today's date in YYYY-MM-DD format (London timezone); recomputed only after midnight."""
+    global _today_cache
+    now = time.time()
+    valid_until, today = _today_cache
+    if now < valid_until:
+        return today
+    
+    local_now = datetime.fromtimestamp(now, LONDON_TZ)
+    today = local_now.strftime("%Y-%m-%d")
+    next_midnight = datetime.combine(local_now.date() + timedelta(days=1), dt_time(), LONDON_TZ)
+    _today_cache = (next_midnight.timestamp(), today)
+    return today